@@ -0,0 +1,387 @@
+"""
+Dashboard aggregates.
+
+Aggregates are computed once per snapshot at ingest time and stored in a
+sidecar file next to it (``donations_<id>.aggregates.json``). The dashboard
+endpoints turn a sidecar into their response with ``dashboard_payload``,
+which only applies the time-dependent trend window and the label used for
+donations without a donor name.
+"""
+import heapq
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.snapshot import DATE_NULL, Snapshot, day_to_iso
+
+
+AGGREGATES_VERSION = 3
+SIDECAR_SUFFIX = ".aggregates.json"
+TOP_DONORS = 5
+RECENT_ACTIVITY = 5
+TREND_MONTHS = 6
+
+
+def empty_dashboard() -> dict:
+    return {
+        "total_donations": 0,
+        "total_amount": 0,
+        "active_donors": 0,
+        "recent_activity": [],
+        "top_donors": [],
+        "monthly_trend": []
+    }
+
+
+def month_key(month_index: int) -> str:
+    """Format a month index (months since January 1970) as ``YYYY-MM``."""
+    return f"{1970 + month_index // 12:04d}-{month_index % 12 + 1:02d}"
+
+
+def trend_months(now: Optional[datetime] = None, months: int = TREND_MONTHS) -> List[Tuple[int, str]]:
+    """
+    Return ``(month_index, label)`` pairs for the trend window, oldest first.
+
+    ``month_index`` counts months since January 1970, the same unit used by
+    ``datetime64[M]``.
+    """
+    now = now or datetime.now()
+    window = []
+    for i in range(months):
+        month_date = now.replace(day=1) - timedelta(days=30 * i)
+        window.append(((month_date.year - 1970) * 12 + month_date.month - 1, month_date.strftime('%b %Y')))
+    window.reverse()
+    return window
+
+
+def display_amount(amount: float):
+    return int(amount) if amount.is_integer() else amount
+
+
+def _bucket_add(totals: np.ndarray, base: int, keys: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Add ``weights`` into a dense array of buckets indexed by ``keys - base``.
+
+    The array grows in either direction as keys outside the current range
+    show up, so callers never need to know the key range up front.
+    """
+    if not len(keys):
+        return totals, base
+    keys = keys.astype(np.int64)
+    low, high = int(keys.min()), int(keys.max())
+    if not len(totals):
+        base = low
+    new_base = min(base, low)
+    size = max(base + len(totals), high + 1) - new_base
+    if new_base != base or size != len(totals):
+        grown = np.zeros(size, dtype=totals.dtype)
+        grown[base - new_base:base - new_base + len(totals)] = totals
+        totals, base = grown, new_base
+    totals += np.bincount(keys - base, weights=weights, minlength=len(totals)).astype(totals.dtype)
+    return totals, base
+
+
+class DonationAggregator:
+    """
+    Single-pass aggregation engine over a snapshot's typed columns.
+
+    Rows are consumed in blocks of ``BLOCK_ROWS``. Every block is read once
+    and feeds all accumulators (totals, per-donor sums and counts, per-day
+    and per-month sums) while it is hot in cache, so the cost is one sequential pass over
+    the Amount, Date and Donor_Name columns whatever the number of metrics.
+    No per-row Python code runs and no dates are parsed.
+    """
+    BLOCK_ROWS = 1 << 16
+
+    def __init__(self, donor_dictionary_size: int = 0):
+        self.rows = 0
+        self.total_amount = 0.0
+        # Slot 0 collects rows without a donor name, slot code+1 the rest
+        self.donor_sums = np.zeros(donor_dictionary_size + 1, dtype=np.float64)
+        self.donor_counts = np.zeros(donor_dictionary_size + 1, dtype=np.int64)
+        self.month_sums = np.zeros(0, dtype=np.float64)
+        self.month_base = 0
+        self.day_sums = np.zeros(0, dtype=np.float64)
+        self.day_counts = np.zeros(0, dtype=np.int64)
+        self.day_base = 0
+
+    def add_block(self, amounts: np.ndarray, days: np.ndarray, donor_codes: np.ndarray):
+        amounts = np.nan_to_num(amounts)
+        slots = donor_codes.astype(np.int64) + 1
+        if len(slots) and slots.max() >= len(self.donor_sums):
+            grow = int(slots.max()) + 1 - len(self.donor_sums)
+            self.donor_sums = np.concatenate([self.donor_sums, np.zeros(grow)])
+            self.donor_counts = np.concatenate([self.donor_counts, np.zeros(grow, dtype=np.int64)])
+
+        self.rows += len(amounts)
+        self.total_amount += float(amounts.sum())
+        self.donor_sums += np.bincount(slots, weights=amounts, minlength=len(self.donor_sums))
+        self.donor_counts += np.bincount(slots, minlength=len(self.donor_counts))
+
+        valid = days != DATE_NULL
+        valid_days, valid_amounts = days[valid], amounts[valid]
+        months = valid_days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        self.month_sums, self.month_base = _bucket_add(self.month_sums, self.month_base, months, valid_amounts)
+        day_base = self.day_base
+        self.day_sums, self.day_base = _bucket_add(self.day_sums, day_base, valid_days, valid_amounts)
+        self.day_counts, _ = _bucket_add(self.day_counts, day_base, valid_days, None)
+
+    def add_snapshot(self, snapshot: Snapshot) -> "DonationAggregator":
+        amounts, days = snapshot.amount, snapshot.dates
+        codes = snapshot.column("Donor_Name").codes
+        for start in range(0, len(snapshot), self.BLOCK_ROWS):
+            stop = start + self.BLOCK_ROWS
+            self.add_block(amounts[start:stop], days[start:stop], codes[start:stop])
+        return self
+
+    @property
+    def active_donors(self) -> int:
+        return int(np.count_nonzero(self.donor_counts[1:]))
+
+    def top_donor_slots(self, k: int = TOP_DONORS) -> List[int]:
+        """Slots of the ``k`` largest donors, largest first, ties in first-seen order."""
+        candidates = np.flatnonzero(self.donor_counts)
+        if len(candidates) > k:
+            # O(donors) selection instead of sorting every donor
+            candidates = candidates[np.argpartition(-self.donor_sums[candidates], k - 1)[:k]]
+        order = np.lexsort((candidates, -self.donor_sums[candidates]))
+        return [int(slot) for slot in candidates[order]]
+
+    def monthly_totals(self) -> dict:
+        return {
+            month_key(self.month_base + offset): float(total)
+            for offset, total in enumerate(self.month_sums)
+            if total
+        }
+
+    def days_with_data(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Sorted day numbers that have donations, with their sums and counts."""
+        offsets = np.flatnonzero(self.day_counts)
+        return offsets + self.day_base, self.day_sums[offsets], self.day_counts[offsets]
+
+    def daily_index(self) -> dict:
+        return daily_index(*self.days_with_data())
+
+
+def daily_index(days: np.ndarray, sums: np.ndarray, counts: np.ndarray) -> dict:
+    """
+    Per-day sums and counts in the stored form, the basis of range rollups.
+
+    Only days with donations are listed, so the size follows the number of
+    distinct dates, not the span between the oldest and newest one.
+    """
+    return {"days": days.tolist(), "sums": sums.tolist(), "counts": counts.tolist()}
+
+
+def recent_activity(snapshot: Snapshot) -> List[dict]:
+    """The last ``RECENT_ACTIVITY`` rows of a snapshot, oldest first."""
+    names = snapshot.column("Donor_Name")
+    amounts, dates = snapshot.amount, snapshot.dates
+    rows = len(snapshot)
+    return [
+        {"name": names[i], "amount": float(np.nan_to_num(amounts[i])), "date": day_to_iso(dates[i])}
+        for i in range(max(0, rows - RECENT_ACTIVITY), rows)
+    ]
+
+
+def compute_aggregates(snapshot: Snapshot) -> dict:
+    """
+    Compute the time-independent aggregates of a snapshot from its typed columns.
+
+    Donor names are kept as ``None`` when missing so each endpoint can apply
+    its own label. Only the names that end up in the result are decoded.
+    """
+    names = snapshot.column("Donor_Name")
+    engine = DonationAggregator(len(names.values)).add_snapshot(snapshot)
+
+    return {
+        "version": AGGREGATES_VERSION,
+        "total_donations": engine.rows,
+        "total_amount": engine.total_amount,
+        "active_donors": engine.active_donors,
+        "top_donors": [
+            {"name": names.decode(slot - 1), "total": float(engine.donor_sums[slot])}
+            for slot in engine.top_donor_slots()
+        ],
+        "recent_activity": recent_activity(snapshot),
+        "monthly_totals": engine.monthly_totals(),
+        "daily": engine.daily_index(),
+    }
+
+
+def _merge_days(a: Tuple[np.ndarray, np.ndarray, np.ndarray], b: Tuple[np.ndarray, np.ndarray, np.ndarray]):
+    """Add two sorted ``(days, sums, counts)`` sets that may share days."""
+    days, slots = np.unique(np.concatenate([a[0], b[0]]), return_inverse=True)
+    sums = np.bincount(slots, weights=np.concatenate([a[1], b[1]]), minlength=len(days))
+    counts = np.bincount(slots, weights=np.concatenate([a[2], b[2]]), minlength=len(days))
+    return days, sums, counts.astype(np.int64)
+
+
+class PartialAggregate:
+    """
+    Mergeable aggregate state of one or more uploads.
+
+    Unlike the compact sidecar, it keeps every donor's total (which doubles
+    as the distinct-donor set) and every per-month and per-day bucket with
+    donations, so two partials can be combined without going back to the rows. Donations
+    without a donor name are kept under the ``""`` key.
+    """
+    VERSION = 2
+
+    def __init__(self):
+        self.rows = 0
+        self.total_amount = 0.0
+        self.donors: Dict[str, float] = {}
+        self.months: Dict[str, float] = {}
+        self.days = np.zeros(0, dtype=np.int64)
+        self.day_sums = np.zeros(0, dtype=np.float64)
+        self.day_counts = np.zeros(0, dtype=np.int64)
+        self.recent_activity: List[dict] = []
+        self.snapshots: List[str] = []
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Snapshot) -> "PartialAggregate":
+        names = snapshot.column("Donor_Name")
+        engine = DonationAggregator(len(names.values)).add_snapshot(snapshot)
+        partial = cls()
+        partial.rows = engine.rows
+        partial.total_amount = engine.total_amount
+        partial.donors = {
+            (names.decode(slot - 1) or ""): float(engine.donor_sums[slot])
+            for slot in np.flatnonzero(engine.donor_counts)
+        }
+        partial.months = engine.monthly_totals()
+        partial.days, partial.day_sums, partial.day_counts = engine.days_with_data()
+        partial.recent_activity = recent_activity(snapshot)
+        partial.snapshots = [snapshot.name]
+        return partial
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PartialAggregate":
+        partial = cls()
+        partial.rows = data["rows"]
+        partial.total_amount = data["total_amount"]
+        partial.donors = data["donors"]
+        partial.months = data["months"]
+        partial.days = np.asarray(data["daily"]["days"], dtype=np.int64)
+        partial.day_sums = np.asarray(data["daily"]["sums"], dtype=np.float64)
+        partial.day_counts = np.asarray(data["daily"]["counts"], dtype=np.int64)
+        partial.recent_activity = data["recent_activity"]
+        partial.snapshots = data["snapshots"]
+        return partial
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.VERSION,
+            "rows": self.rows,
+            "total_amount": self.total_amount,
+            "donors": self.donors,
+            "months": self.months,
+            "daily": daily_index(self.days, self.day_sums, self.day_counts),
+            "recent_activity": self.recent_activity,
+            "snapshots": self.snapshots,
+        }
+
+    def merge(self, other: "PartialAggregate") -> "PartialAggregate":
+        """
+        Fold ``other`` (a newer upload) into this partial in place.
+
+        Costs O(size of ``other``): its donors, months and days are added into
+        the existing maps; nothing already merged is revisited.
+        """
+        self.rows += other.rows
+        self.total_amount += other.total_amount
+        for name, total in other.donors.items():
+            self.donors[name] = self.donors.get(name, 0.0) + total
+        for month, total in other.months.items():
+            self.months[month] = self.months.get(month, 0.0) + total
+        self.days, self.day_sums, self.day_counts = _merge_days(
+            (self.days, self.day_sums, self.day_counts), (other.days, other.day_sums, other.day_counts),
+        )
+        self.recent_activity = (self.recent_activity + other.recent_activity)[-RECENT_ACTIVITY:]
+        self.snapshots = self.snapshots + other.snapshots
+        return self
+
+    def to_aggregates(self) -> dict:
+        """Compact aggregates in the sidecar format read by the endpoints."""
+        top_donors = heapq.nlargest(TOP_DONORS, self.donors.items(), key=lambda item: item[1])
+        return {
+            "version": AGGREGATES_VERSION,
+            "total_donations": self.rows,
+            "total_amount": self.total_amount,
+            "active_donors": sum(1 for name in self.donors if name),
+            "top_donors": [{"name": name or None, "total": total} for name, total in top_donors],
+            "recent_activity": self.recent_activity,
+            "monthly_totals": self.months,
+            "daily": daily_index(self.days, self.day_sums, self.day_counts),
+            "snapshot_count": len(self.snapshots),
+        }
+
+
+def dashboard_payload(aggregates: dict, unknown_name: str = "Unknown", now: Optional[datetime] = None) -> dict:
+    """Shape stored aggregates into the ``/dashboard-data`` response."""
+    if not aggregates["total_donations"]:
+        return empty_dashboard()
+
+    monthly_totals = aggregates["monthly_totals"]
+    return {
+        "total_donations": aggregates["total_donations"],
+        "total_amount": round(aggregates["total_amount"], 2),
+        "active_donors": aggregates["active_donors"],
+        "recent_activity": [
+            {
+                "type": "donation",
+                "message": f"${display_amount(item['amount'])} from {item['name'] or unknown_name}",
+                "date": item["date"],
+                "amount": item["amount"]
+            }
+            for item in aggregates["recent_activity"]
+        ],
+        "top_donors": [
+            {"name": donor["name"] or unknown_name, "total": donor["total"]}
+            for donor in aggregates["top_donors"]
+        ],
+        "monthly_trend": [
+            {"month": label, "amount": monthly_totals.get(month_key(month), 0.0)}
+            for month, label in trend_months(now)
+        ]
+    }
+
+
+def sidecar_path(snapshot_path: str) -> str:
+    root, _ = os.path.splitext(snapshot_path)
+    return root + SIDECAR_SUFFIX
+
+
+def write_aggregates(snapshot_path: str, aggregates: dict):
+    path = sidecar_path(snapshot_path)
+    tmp_path = f"{path}.part"
+    with open(tmp_path, "w") as f:
+        json.dump(aggregates, f)
+    os.replace(tmp_path, path)
+
+
+def load_aggregates(snapshot_path: str) -> dict:
+    """
+    Return the stored aggregates for a snapshot.
+
+    Snapshots written before sidecars existed (or with an outdated sidecar)
+    are aggregated on first use and the sidecar is written for next time.
+    """
+    try:
+        with open(sidecar_path(snapshot_path)) as f:
+            aggregates = json.load(f)
+        if aggregates.get("version") == AGGREGATES_VERSION:
+            return aggregates
+    except (OSError, ValueError):
+        pass
+
+    aggregates = compute_aggregates(Snapshot.open(snapshot_path))
+    try:
+        write_aggregates(snapshot_path, aggregates)
+    except OSError:
+        pass
+    return aggregates
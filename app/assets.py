@@ -0,0 +1,98 @@
+"""
+Static assets of the admin portal and the login page.
+
+The files in ``app/static`` are loaded once per process together with a
+precomputed gzip variant. Stylesheets and scripts are served under
+content-hashed names (``/static/admin.3f9a1c2b7d4e.js``) with a year-long
+immutable ``Cache-Control``: a changed file gets a new URL, so browsers never
+need to revalidate them. The HTML pages reference the hashed names and are
+served with an ETag and ``no-cache``, so a repeat visit costs a 304.
+"""
+import gzip
+import hashlib
+import os
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.compression import accepts_gzip
+from app.http_cache import is_not_modified
+
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_URL = "/static/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+MEDIA_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".js": "application/javascript; charset=utf-8",
+}
+
+
+class Asset(NamedTuple):
+    body: bytes
+    gzipped: bytes
+    media_type: str
+    etag: str
+
+
+def _asset(body: bytes, extension: str) -> Asset:
+    digest = hashlib.sha256(body).hexdigest()
+    return Asset(body, gzip.compress(body, compresslevel=9, mtime=0), MEDIA_TYPES[extension], f'"{digest[:16]}"')
+
+
+class StaticAssets:
+    def __init__(self, directory: str = STATIC_DIR):
+        # Served at /static/<name>: hashed names are immutable, plain names revalidate
+        self.immutable: Dict[str, Asset] = {}
+        self.revalidated: Dict[str, Asset] = {}
+        self.pages: Dict[str, Asset] = {}
+        self.urls: Dict[str, str] = {}
+
+        names = sorted(os.listdir(directory))
+        for name in names:
+            stem, extension = os.path.splitext(name)
+            if extension not in MEDIA_TYPES or extension == ".html":
+                continue
+            with open(os.path.join(directory, name), "rb") as f:
+                body = f.read()
+            asset = _asset(body, extension)
+            hashed_name = f"{stem}.{hashlib.sha256(body).hexdigest()[:12]}{extension}"
+            self.immutable[hashed_name] = asset
+            self.revalidated[name] = asset
+            self.urls[name] = STATIC_URL + hashed_name
+
+        for name in names:
+            if name.endswith(".html"):
+                with open(os.path.join(directory, name)) as f:
+                    html = f.read()
+                for plain, url in self.urls.items():
+                    html = html.replace(f'"{STATIC_URL}{plain}"', f'"{url}"')
+                self.pages[name] = _asset(html.encode("utf-8"), ".html")
+
+    def get(self, name: str) -> Optional[Tuple[Asset, str]]:
+        """The asset at ``/static/<name>`` and its Cache-Control, or ``None``."""
+        if name in self.immutable:
+            return self.immutable[name], IMMUTABLE_CACHE_CONTROL
+        if name in self.revalidated:
+            return self.revalidated[name], REVALIDATE_CACHE_CONTROL
+        return None
+
+    @staticmethod
+    def respond(request: Request, asset: Asset, cache_control: str) -> Response:
+        """Serve ``asset``: 304 if the client's copy is current, gzip if accepted."""
+        headers = {"ETag": asset.etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if is_not_modified(request, asset.etag):
+            return Response(status_code=304, headers=headers)
+        if accepts_gzip(request.headers.get("accept-encoding", "")):
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=asset.gzipped, media_type=asset.media_type, headers=headers)
+        return Response(content=asset.body, media_type=asset.media_type, headers=headers)
+
+    def page(self, request: Request, name: str) -> Response:
+        return self.respond(request, self.pages[name], REVALIDATE_CACHE_CONTROL)
+
+
+static_assets = StaticAssets()
@@ -0,0 +1,175 @@
+"""
+Batch uploads.
+
+A batch is any number of workbooks, CSV/TSV/NDJSON files and zip archives
+of those. Every worksheet of every workbook, and every text file, is one
+part: parts are parsed and validated in
+parallel across the ingest process pool, each into a temporary snapshot in
+``data/.incoming``, and the parts that produced rows are then merged into a
+single snapshot by concatenating their column buffers. The result lists the
+status of every part.
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+import zipfile
+from typing import List, Optional, Tuple
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from app.ingest import (
+    EXCEL_EXTENSIONS, INCOMING_DIR, UPLOAD_EXTENSIONS, UPLOAD_READ_SIZE, get_ingest_pool, ingest_snapshots,
+    iter_upload_chunks, notify_uploaded,
+)
+from app.snapshot import AMOUNT_COLUMN, DATA_DIR, SNAPSHOT_EXT, SnapshotWriter
+from app.validation import RowValidator
+
+
+BATCH_EXTENSIONS = UPLOAD_EXTENSIONS + (".zip",)
+
+
+def expand_upload(staged_path: str, filename: str, incoming_dir: str = INCOMING_DIR) -> List[Tuple[str, str]]:
+    """
+    Return ``(path, name)`` for each file in an upload.
+
+    Supported files inside a zip archive are extracted next to the staged upload
+    under generated names; other members are ignored.
+    """
+    if not filename.lower().endswith(".zip"):
+        return [(staged_path, filename)]
+
+    workbooks = []
+    with zipfile.ZipFile(staged_path) as archive:
+        for member in archive.infolist():
+            basename = os.path.basename(member.filename)
+            if member.is_dir() or member.filename.startswith("__MACOSX/") or basename.startswith("."):
+                continue
+            suffix = os.path.splitext(basename)[1].lower()
+            if suffix not in UPLOAD_EXTENSIONS:
+                continue
+            fd, path = tempfile.mkstemp(suffix=suffix, dir=incoming_dir)
+            with os.fdopen(fd, "wb") as out, archive.open(member) as src:
+                shutil.copyfileobj(src, out, UPLOAD_READ_SIZE)
+            workbooks.append((path, f"{filename}/{member.filename}"))
+    return workbooks
+
+
+def list_sheets(path: str, name: str) -> List[Optional[str]]:
+    """Worksheet names of a workbook; text formats are a single part named ``None``."""
+    if not name.lower().endswith(EXCEL_EXTENSIONS):
+        return [None]
+    if name.lower().endswith(".xlsx"):
+        workbook = load_workbook(path, read_only=True)
+        try:
+            return workbook.sheetnames
+        finally:
+            workbook.close()
+    return pd.ExcelFile(path).sheet_names
+
+
+def parse_part(path: str, name: str, sheet: Optional[str], out_path: str) -> dict:
+    """
+    Validate the rows of one worksheet into a temporary snapshot at ``out_path``.
+
+    Worksheets or files without an ``Amount`` column (notes, instructions,
+    pivot tables) are skipped rather than stored as donations.
+    """
+    validator = RowValidator()
+    writer = SnapshotWriter(out_path, {"source": f"{name}[{sheet}]" if sheet is not None else name})
+    try:
+        for chunk in iter_upload_chunks(path, name, sheet):
+            if not len(chunk):
+                continue
+            if AMOUNT_COLUMN not in chunk.columns:
+                writer.abort()
+                return {"records_count": 0, "status": "skipped", "error": f"no {AMOUNT_COLUMN} column"}
+            writer.write(validator(chunk))
+    except Exception:
+        writer.abort()
+        raise
+    writer.close()
+    result = {"records_count": writer.records_count}
+    result.update(validator.report())
+    return result
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def run_batch_ingest(
+    staged: List[Tuple[str, str]],
+    append: bool = False,
+    incoming_dir: str = INCOMING_DIR,
+) -> dict:
+    """
+    Ingest staged uploads, given as ``(path, original filename)``, as one snapshot.
+
+    The staged files are removed afterwards. The result has the usual
+    snapshot fields plus ``parts``, one entry per worksheet (or per upload
+    that could not be opened) with its status: ``ingested``, ``empty``,
+    ``skipped`` or ``failed``.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_ingest_pool()
+    temporary = [path for path, _ in staged]
+    parts: List[dict] = []
+
+    def run(func, *args):
+        return loop.run_in_executor(pool, func, *args)
+
+    try:
+        workbooks = []
+        for (path, filename), expanded in zip(staged, await asyncio.gather(
+            *(run(expand_upload, path, filename, incoming_dir) for path, filename in staged),
+            return_exceptions=True,
+        )):
+            if isinstance(expanded, Exception):
+                parts.append({"file": filename, "sheet": None, "status": "failed", "error": str(expanded)})
+                continue
+            temporary.extend(p for p, _ in expanded if p != path)
+            workbooks.extend(expanded)
+
+        tasks: List[Tuple[dict, str, asyncio.Future]] = []
+        for (path, name), sheets in zip(workbooks, await asyncio.gather(
+            *(run(list_sheets, path, name) for path, name in workbooks),
+            return_exceptions=True,
+        )):
+            if isinstance(sheets, Exception):
+                parts.append({"file": name, "sheet": None, "status": "failed", "error": str(sheets)})
+                continue
+            for sheet in sheets:
+                fd, out_path = tempfile.mkstemp(suffix=SNAPSHOT_EXT, dir=incoming_dir)
+                os.close(fd)
+                temporary.append(out_path)
+                part = {"file": name, "sheet": sheet}
+                parts.append(part)
+                tasks.append((part, out_path, run(parse_part, path, name, sheet, out_path)))
+
+        part_paths = []
+        for part, out_path, task in tasks:
+            try:
+                part.update(await task)
+            except Exception as e:
+                part.update(status="failed", error=str(e))
+                continue
+            part.setdefault("status", "ingested" if part["records_count"] else "empty")
+            if part["records_count"]:
+                part_paths.append(out_path)
+
+        source_name = ", ".join(filename for _, filename in staged)
+        if part_paths:
+            result = await run(ingest_snapshots, part_paths, source_name, DATA_DIR, append)
+            notify_uploaded()
+        else:
+            result = {"filename": None, "records_count": 0, "file_path": None}
+        result["parts"] = parts
+        return result
+    finally:
+        for path in temporary:
+            _remove(path)
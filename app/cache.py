@@ -0,0 +1,138 @@
+"""
+In-process cache of snapshot aggregates and the indexes derived from them.
+
+Entries are keyed on the identity ``(path, mtime_ns, size)`` of the file
+they were read from, so a replaced file is never served stale, and evicted
+least-recently-used first once their estimated size exceeds the memory
+budget.
+
+A miss loads without holding the cache lock: concurrent requests for the
+same key wait for the one load in progress, other keys are not held up.
+Loads read files, so callers on the event loop should call in from a
+worker thread.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Tuple
+
+from app.aggregates import load_aggregates
+from app.rollup import DailyIndex
+
+
+SNAPSHOT_CACHE_MB = int(os.getenv("SNAPSHOT_CACHE_MB", "256"))
+
+
+class _Load:
+    def __init__(self):
+        self._done = threading.Event()
+        self._value = None
+        self._error = None
+
+    def succeed(self, value):
+        self._value = value
+        self._done.set()
+
+    def fail(self, error: BaseException):
+        self._error = error
+        self._done.set()
+
+    def result(self):
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class SnapshotCache:
+    def __init__(self, max_bytes: int = SNAPSHOT_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[tuple, Tuple[object, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Loads in progress; waiters block on the event, not on _lock
+        self._loading: Dict[tuple, "_Load"] = {}
+
+    @staticmethod
+    def file_key(path: str) -> tuple:
+        stat = os.stat(path)
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def _get(self, key: tuple, load: Callable[[], Tuple[object, int]]):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            # A burst of requests for a snapshot that is not cached yet
+            # only loads it once
+            pending = self._loading.get(key)
+            owner = pending is None
+            if owner:
+                self.misses += 1
+                pending = self._loading[key] = _Load()
+
+        if not owner:
+            return pending.result()
+
+        try:
+            value, size = load()
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            pending.fail(e)
+            raise
+        with self._lock:
+            del self._loading[key]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+        pending.succeed(value)
+        return value
+
+    def get_aggregates(self, path: str) -> dict:
+        def load():
+            aggregates = load_aggregates(path)
+            return aggregates, len(json.dumps(aggregates))
+        return self._get(("aggregates",) + self.file_key(path), load)
+
+    def get_daily_index(self, path: str) -> DailyIndex:
+        def load():
+            index = DailyIndex.from_aggregates(self.get_aggregates(path))
+            return index, 16 * (index.days + 1)
+        return self._get(("daily_index",) + self.file_key(path), load)
+
+    def get_history_aggregates(self, path: str) -> dict:
+        def load():
+            with open(path) as f:
+                aggregates = json.load(f)
+            return aggregates, os.path.getsize(path)
+        return self._get(("history",) + self.file_key(path), load)
+
+    def get_history_daily_index(self, path: str) -> DailyIndex:
+        def load():
+            index = DailyIndex.from_aggregates(self.get_history_aggregates(path))
+            return index, 16 * (index.days + 1)
+        return self._get(("history_daily_index",) + self.file_key(path), load)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+snapshot_cache = SnapshotCache()
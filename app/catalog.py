@@ -0,0 +1,197 @@
+"""
+Manifest of the snapshots in ``data/``.
+
+``data/manifest.json`` lists every snapshot, newest first, with its created
+time, size, record count and total amount. Ingest workers update it under a
+file lock and replace it atomically. Readers keep the parsed manifest in
+memory and only re-read it when its stat signature changes, so finding the
+latest snapshot or listing uploads never touches the snapshot files.
+"""
+import fcntl
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.snapshot import DATA_DIR, LEGACY_EXT, SNAPSHOT_EXT, Snapshot, list_snapshot_files
+
+
+MANIFEST_NAME = "manifest.json"
+
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+@contextmanager
+def file_lock(lock_path: str):
+    """
+    Hold an exclusive lock on ``lock_path`` across threads and processes.
+
+    ``flock`` serializes the ingest worker processes; the per-path thread
+    lock covers threads of the same process, which share one flock owner.
+    """
+    with _thread_locks_guard:
+        thread_lock = _thread_locks.setdefault(os.path.abspath(lock_path), threading.Lock())
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    with thread_lock, open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def snapshot_entry(
+    file_path: str,
+    records_count: Optional[int] = None,
+    total_amount: Optional[float] = None,
+    created: Optional[datetime] = None,
+    content_hash: Optional[str] = None,
+) -> dict:
+    """
+    Build a manifest entry, reading the snapshot only for values not supplied.
+
+    ``content_hash`` is the SHA-256 of the uploaded workbook, used to
+    recognise a re-upload of the same file.
+    """
+    stat = os.stat(file_path)
+    if records_count is None or total_amount is None:
+        snapshot = Snapshot.open(file_path)
+        records_count = len(snapshot)
+        total_amount = float(np.nansum(snapshot.amount))
+    created = created or datetime.fromtimestamp(stat.st_mtime)
+    entry = {
+        "filename": os.path.basename(file_path),
+        "created": created.isoformat(),
+        "size": stat.st_size,
+        "records_count": records_count,
+        "total_amount": round(total_amount, 2),
+    }
+    if content_hash:
+        entry["sha256"] = content_hash
+    return entry
+
+
+class SnapshotCatalog:
+    def __init__(self, data_dir: str = DATA_DIR):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, MANIFEST_NAME)
+        self._lock_path = os.path.join(data_dir, f".{MANIFEST_NAME}.lock")
+        self._entries: List[dict] = []
+        self._by_hash: Dict[str, dict] = {}
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._checked_at = float("-inf")
+
+    def _current_signature(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        # os.replace gives every manifest version a new inode
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _locked(self):
+        return file_lock(self._lock_path)
+
+    def _read(self) -> List[dict]:
+        with open(self.path) as f:
+            return json.load(f)["snapshots"]
+
+    def _write(self, entries: List[dict]):
+        tmp_path = f"{self.path}.part"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": 1, "snapshots": entries}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _scan(self, hashes: Optional[Dict[str, str]] = None) -> List[dict]:
+        hashes = hashes or {}
+        return [
+            snapshot_entry(os.path.join(self.data_dir, filename), content_hash=hashes.get(filename))
+            for filename in list_snapshot_files(self.data_dir)
+        ]
+
+    def _known_hashes(self) -> Dict[str, str]:
+        """
+        Upload hashes recorded in the current manifest, by snapshot filename.
+
+        A legacy ``.json`` snapshot's hash is also listed under the ``.dsnap``
+        name it is converted to.
+        """
+        try:
+            entries = self._read()
+        except (OSError, ValueError, KeyError):
+            return {}
+        hashes = {}
+        for entry in entries:
+            if "sha256" not in entry:
+                continue
+            hashes[entry["filename"]] = entry["sha256"]
+            root, ext = os.path.splitext(entry["filename"])
+            if ext == LEGACY_EXT:
+                hashes.setdefault(root + SNAPSHOT_EXT, entry["sha256"])
+        return hashes
+
+    def entries(self, max_age: float = 0.0) -> List[dict]:
+        """
+        Return all manifest entries, newest first.
+
+        With ``max_age`` the manifest is not even stat'ed again if it was
+        checked less than ``max_age`` seconds ago, unless ``invalidate`` was
+        called since.
+        """
+        now = time.monotonic()
+        if self._signature is not None and now - self._checked_at < max_age:
+            return self._entries
+        self._checked_at = now
+        signature = self._current_signature()
+        if signature is None:
+            if not os.path.exists(self.data_dir):
+                return []
+            # First run against an existing data/ directory
+            self.rebuild()
+            signature = self._current_signature()
+        if signature != self._signature:
+            self._entries = self._read()
+            # Oldest first so the earliest snapshot of a repeated upload wins
+            self._by_hash = {e["sha256"]: e for e in reversed(self._entries) if "sha256" in e}
+            self._signature = signature
+        return self._entries
+
+    def latest(self, max_age: float = 0.0) -> Optional[dict]:
+        entries = self.entries(max_age)
+        return entries[0] if entries else None
+
+    def invalidate(self):
+        """Make the next ``entries`` call check the manifest regardless of ``max_age``."""
+        self._checked_at = float("-inf")
+
+    def find_by_hash(self, content_hash: str) -> Optional[dict]:
+        """Return the entry of an earlier upload of the same file, if any."""
+        self.entries()
+        return self._by_hash.get(content_hash)
+
+    def add(self, entry: dict):
+        """Record a new snapshot as the latest one."""
+        with self._locked():
+            entries = self._read() if os.path.exists(self.path) else self._scan()
+            entries = [e for e in entries if e["filename"] != entry["filename"]]
+            entries.insert(0, entry)
+            self._write(entries)
+
+    def rebuild(self):
+        """
+        Re-create the manifest from the snapshot files on disk.
+
+        Upload hashes cannot be derived from the snapshots, so the ones the
+        old manifest recorded are carried over.
+        """
+        with self._locked():
+            self._write(self._scan(self._known_hashes()))
+
+
+catalog = SnapshotCatalog()
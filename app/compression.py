@@ -0,0 +1,171 @@
+"""
+gzip compression of HTML and JSON responses.
+
+``CompressionMiddleware`` compresses complete response bodies of at least
+``COMPRESSION_MIN_BYTES`` when the client's ``Accept-Encoding`` allows gzip.
+Responses that are already encoded (the prerendered public dashboard and the
+static assets), streamed, or of a type that does not compress well are
+passed through untouched.
+
+Compressed bodies are kept in a small in-process cache keyed on a digest of
+the uncompressed body, so a page or payload that has not changed since the
+last request is hashed, not recompressed. Responses marked ``no-store`` are
+never cached.
+"""
+import gzip
+import hashlib
+import os
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "6"))
+COMPRESSION_CACHE_MB = int(os.getenv("COMPRESSION_CACHE_MB", "16"))
+COMPRESSIBLE_TYPES = ("text/html", "text/plain", "text/css", "text/csv", "application/json", "application/javascript")
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an ``Accept-Encoding`` header allows gzip, honouring ``q=0``."""
+    wildcard = False
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding in ("gzip", "x-gzip"):
+            return quality > 0
+        if coding == "*":
+            wildcard = quality > 0
+    return wildcard
+
+
+class CompressedBodyCache:
+    """LRU map of body digest to gzip bytes, bounded by the compressed size."""
+
+    def __init__(self, max_bytes: int = COMPRESSION_CACHE_MB * 1024 * 1024, level: int = COMPRESSION_LEVEL):
+        self.max_bytes = max_bytes
+        self.level = level
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._bytes = 0
+
+    def compress(self, body: bytes, cacheable: bool = True) -> bytes:
+        if not cacheable or not self.max_bytes:
+            return gzip.compress(body, compresslevel=self.level, mtime=0)
+
+        key = hashlib.sha256(body).digest()
+        compressed = self._entries.get(key)
+        if compressed is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return compressed
+
+        self.misses += 1
+        compressed = gzip.compress(body, compresslevel=self.level, mtime=0)
+        if len(compressed) <= self.max_bytes:
+            self._entries[key] = compressed
+            self._bytes += len(compressed)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+        return compressed
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+compressed_bodies = CompressedBodyCache()
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[str]:
+    for k, v in headers:
+        if k.lower() == name:
+            return v.decode("latin1")
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware that gzips eligible responses.
+
+    The response start is held back until the first body message: a body
+    that arrives in one piece is compressed if it qualifies, anything else
+    is forwarded as it was produced.
+    """
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_BYTES, cache: CompressedBodyCache = compressed_bodies):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request_headers = scope.get("headers", [])
+        if not accepts_gzip(_header(request_headers, b"accept-encoding") or ""):
+            return await self.app(scope, receive, send)
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start, passthrough
+            if passthrough:
+                return await send(message)
+
+            if message["type"] == "http.response.start":
+                start = message
+                return
+
+            body = message.get("body", b"")
+            if start is None or message["type"] != "http.response.body":
+                passthrough = True
+                return await send(message)
+
+            passthrough = True
+            headers = list(start.get("headers", []))
+            if message.get("more_body", False) or not self._eligible(start["status"], headers, body):
+                await send(start)
+                return await send(message)
+
+            cacheable = "no-store" not in (_header(headers, b"cache-control") or "").lower()
+            compressed = self.cache.compress(body, cacheable)
+            headers = [(k, v) for k, v in headers if k.lower() not in (b"content-length", b"vary")]
+            vary = _header(start.get("headers", []), b"vary")
+            if not vary:
+                vary = "Accept-Encoding"
+            elif "accept-encoding" not in vary.lower():
+                vary = f"{vary}, Accept-Encoding"
+            headers += [
+                (b"content-encoding", b"gzip"),
+                (b"content-length", str(len(compressed)).encode("ascii")),
+                (b"vary", vary.encode("latin1")),
+            ]
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _eligible(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> bool:
+        if status < 200 or status in (204, 304) or len(body) < self.minimum_size:
+            return False
+        if _header(headers, b"content-encoding") is not None:
+            return False
+        content_type = (_header(headers, b"content-type") or "").lower()
+        return content_type.startswith(COMPRESSIBLE_TYPES)
@@ -0,0 +1,251 @@
+import gzip
+import hashlib
+import os
+import threading
+from datetime import date, datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from app import sql_store
+from app.aggregates import dashboard_payload
+from app.cache import snapshot_cache
+from app.catalog import catalog
+from app.history import history_aggregates_path, sync_history
+from app.public_page import NO_DATA_PAGE, render_dashboard
+from app.snapshot import DATA_DIR
+
+
+PUBLIC_DASHBOARD_CACHE_CONTROL = os.getenv("PUBLIC_DASHBOARD_CACHE_CONTROL", "public, max-age=60")
+# How stale the in-memory manifest may be before /public-dashboard checks it again
+PUBLIC_DASHBOARD_RECHECK_SECONDS = float(os.getenv("PUBLIC_DASHBOARD_RECHECK_SECONDS", "5"))
+PUBLIC_DASHBOARD_PRERENDER = os.getenv("PUBLIC_DASHBOARD_PRERENDER", "1") == "1"
+
+SCOPES = ("latest", "history")
+
+
+def latest_dashboard(unknown_name: str = "Unknown") -> Optional[dict]:
+    """
+    Return the dashboard aggregates for the newest upload.
+
+    Reads from the SQLite store when it is enabled and from the latest
+    snapshot otherwise. Returns ``None`` when there is no donation data.
+    """
+    if sql_store.SQL_STORE_ENABLED:
+        return sql_store.latest_dashboard(unknown_name)
+
+    latest = catalog.latest()
+    if latest is None or not latest["records_count"]:
+        return None
+
+    # Precomputed at ingest; older snapshots are aggregated once on first use
+    latest_file = latest["filename"]
+    aggregates = snapshot_cache.get_aggregates(os.path.join(DATA_DIR, latest_file))
+
+    summary = dashboard_payload(aggregates, unknown_name)
+    summary["data_source"] = latest_file
+    return summary
+
+
+def latest_rollup(start: Optional[date], end: Optional[date], granularity: str) -> dict:
+    """
+    Bucket the newest upload's donations by day, week, month or year.
+
+    Served from the per-day index stored with the snapshot's aggregates.
+    Raises ``ValueError`` for an invalid range or granularity.
+    """
+    latest = catalog.latest()
+    if latest is None:
+        return {"granularity": granularity, "buckets": []}
+
+    latest_file = latest["filename"]
+    index = snapshot_cache.get_daily_index(os.path.join(DATA_DIR, latest_file))
+    return {
+        "granularity": granularity,
+        "first_date": index.first_date,
+        "last_date": index.last_date,
+        "buckets": index.rollup(start, end, granularity),
+        "data_source": latest_file,
+    }
+
+
+_history_sync_running = threading.Lock()
+
+
+def _sync_history_in_background():
+    """Catch the history up in a thread of its own; at most one at a time."""
+    if not _history_sync_running.acquire(blocking=False):
+        return
+
+    def run():
+        try:
+            sync_history(DATA_DIR)
+        finally:
+            _history_sync_running.release()
+
+    threading.Thread(target=run, name="history-sync", daemon=True).start()
+
+
+def _history_path() -> Optional[str]:
+    """
+    Return the path of the all-history aggregates, or ``None`` without uploads.
+
+    Snapshots that are in the manifest but not yet merged (ingested before
+    history tracking existed, or being ingested right now) are merged in the
+    background while the current aggregates are served; the request never
+    waits on the history lock unless there are no aggregates at all yet.
+    """
+    entries = catalog.entries()
+    if not entries:
+        return None
+    path = history_aggregates_path(DATA_DIR)
+    try:
+        current = snapshot_cache.get_history_aggregates(path)["snapshot_count"] == len(entries)
+    except (OSError, ValueError, KeyError):
+        if not os.path.exists(path):
+            sync_history(DATA_DIR)
+            return path
+        current = False
+    if not current:
+        _sync_history_in_background()
+    return path
+
+
+def _history_source(path: str) -> str:
+    return f"all uploads ({snapshot_cache.get_history_aggregates(path)['snapshot_count']} files)"
+
+
+def history_dashboard(unknown_name: str = "Unknown") -> Optional[dict]:
+    """Return the dashboard aggregates over every upload, or ``None`` without data."""
+    path = _history_path()
+    if path is None:
+        return None
+    aggregates = snapshot_cache.get_history_aggregates(path)
+    if not aggregates["total_donations"]:
+        return None
+
+    summary = dashboard_payload(aggregates, unknown_name)
+    summary["data_source"] = _history_source(path)
+    return summary
+
+
+def history_rollup(start: Optional[date], end: Optional[date], granularity: str) -> dict:
+    """Like ``latest_rollup`` but over the donations of every upload."""
+    path = _history_path()
+    if path is None:
+        return {"granularity": granularity, "buckets": []}
+
+    index = snapshot_cache.get_history_daily_index(path)
+    return {
+        "granularity": granularity,
+        "first_date": index.first_date,
+        "last_date": index.last_date,
+        "buckets": index.rollup(start, end, granularity),
+        "data_source": _history_source(path),
+    }
+
+
+def dashboard_data(scope: str = "latest", unknown_name: str = "Unknown") -> Optional[dict]:
+    """Dispatch to the newest upload or all history depending on ``scope``."""
+    if scope == "history":
+        return history_dashboard(unknown_name)
+    return latest_dashboard(unknown_name)
+
+
+def rollup(start: Optional[date], end: Optional[date], granularity: str, scope: str = "latest") -> dict:
+    if scope == "history":
+        return history_rollup(start, end, granularity)
+    return latest_rollup(start, end, granularity)
+
+
+def dashboard_version(scope: str = "latest") -> Tuple[str, Optional[datetime]]:
+    """
+    Return the ETag and last-modified time of the dashboard for ``scope``.
+
+    Derived from the in-memory manifest only: the newest snapshot, the
+    number of snapshots and the current month (the trend window moves with
+    it), so answering a conditional request reads nothing from ``data/``.
+    """
+    entries = catalog.entries(PUBLIC_DASHBOARD_RECHECK_SECONDS)
+    latest = entries[0] if entries else None
+    identity = "|".join([
+        scope,
+        latest["filename"] if latest else "",
+        str(len(entries)),
+        date.today().strftime("%Y-%m"),
+    ])
+    etag = f'"{hashlib.sha1(identity.encode()).hexdigest()[:20]}"'
+    last_modified = datetime.fromisoformat(latest["created"]) if latest else None
+    return etag, last_modified
+
+
+class RenderedPage(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime]
+    html: bytes
+    gzipped: bytes
+
+
+_rendered: Dict[str, RenderedPage] = {}
+_render_lock = threading.Lock()
+_background_render_running = threading.Lock()
+
+
+def render_public_page(scope: str = "latest", last_modified: Optional[datetime] = None) -> str:
+    summary = dashboard_data(scope, unknown_name="Anonymous")
+    if summary is None:
+        return NO_DATA_PAGE
+    return render_dashboard(summary, last_modified or datetime.now())
+
+
+def prerendered_public_page(scope: str, etag: str, last_modified: Optional[datetime]) -> RenderedPage:
+    """
+    Return the rendered public page for ``scope`` at version ``etag``.
+
+    The HTML and its gzip encoding are kept in memory, so while the data is
+    unchanged serving the page costs a dict lookup. A new version is
+    rendered once, by whichever caller sees it first.
+    """
+    page = _rendered.get(scope)
+    if page is not None and page.etag == etag:
+        return page
+    with _render_lock:
+        page = _rendered.get(scope)
+        if page is None or page.etag != etag:
+            html = render_public_page(scope, last_modified).encode("utf-8")
+            page = _rendered[scope] = RenderedPage(etag, last_modified, html, gzip.compress(html, mtime=0))
+    return page
+
+
+def _render_in_background(scope: str, etag: str, last_modified: Optional[datetime]):
+    """Render a new version of the page in a thread of its own; at most one at a time."""
+    if not _background_render_running.acquire(blocking=False):
+        return
+
+    def run():
+        try:
+            prerendered_public_page(scope, etag, last_modified)
+        finally:
+            _background_render_running.release()
+
+    threading.Thread(target=run, name="public-page-render", daemon=True).start()
+
+
+def current_public_page(scope: str, etag: str, last_modified: Optional[datetime]) -> Optional[RenderedPage]:
+    """
+    Return the last rendered public page for ``scope`` without waiting.
+
+    If it is older than ``etag``, the new version is rendered in the
+    background and the older page is served until it is ready. ``None``
+    means no page has been rendered yet.
+    """
+    page = _rendered.get(scope)
+    if page is not None and page.etag != etag:
+        _render_in_background(scope, etag, last_modified)
+    return page
+
+
+def refresh_public_pages():
+    """Render the public page of every scope for the current data, ahead of the next visitor."""
+    if not PUBLIC_DASHBOARD_PRERENDER:
+        return
+    for scope in SCOPES:
+        prerendered_public_page(scope, *dashboard_version(scope))
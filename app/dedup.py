@@ -0,0 +1,190 @@
+"""
+Transaction_ID index for append-mode uploads.
+
+``data/transactions.idx.npz`` holds one entry per known ``Transaction_ID``:
+a 64-bit hash of the id and a 64-bit fingerprint of the donation it was
+first seen with (donor, amount, date, payment method), sorted by id hash,
+plus the names of the snapshots it covers. Snapshots written by regular
+uploads are folded in the next time the index is loaded.
+
+Ids and fingerprints are hashed column-wise with pandas' vectorized hashing,
+and a batch of rows is checked against the index with one vectorized binary
+search, so the cost per upload is O(rows * log(known ids)) with no per-row
+Python code. Rows whose id is already known are skipped as duplicates when
+the fingerprint matches and reported as conflicts when it does not; repeats
+within one upload are found with ``np.unique``.
+"""
+import os
+from contextlib import contextmanager
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from app.catalog import SnapshotCatalog, file_lock
+from app.snapshot import DATA_DIR, DATE_NULL, Snapshot, as_frame, to_amounts, to_day_ordinals, to_text_array
+
+
+INDEX_NAME = "transactions.idx.npz"
+# Bump when the hashing changes; an index of another version is rebuilt
+INDEX_VERSION = 2
+ENTRY_DTYPE = np.dtype([("key", "<u8"), ("fingerprint", "<u8")])
+
+INSERTED = 0
+DUPLICATE = 1
+CONFLICT = 2
+
+
+def _row_hashes(
+    ids: List[str],
+    names: List[Optional[str]],
+    amounts: np.ndarray,
+    days: np.ndarray,
+    methods: List[Optional[str]],
+):
+    """Return the id hashes and donation fingerprints of a batch of rows."""
+    keys = pd.util.hash_array(np.asarray(ids, dtype=object))
+    fingerprints = pd.util.hash_pandas_object(pd.DataFrame({
+        "name": pd.Series(names, dtype=object).fillna(""),
+        "amount": np.asarray(amounts, dtype=np.float64),
+        "day": np.asarray(days, dtype=np.int32),
+        "method": pd.Series(methods, dtype=object).fillna(""),
+    }), index=False).to_numpy()
+    return keys, fingerprints
+
+
+class TransactionIndex:
+    def __init__(self, entries: Optional[np.ndarray] = None, snapshots: Optional[List[str]] = None):
+        self._entries = entries if entries is not None else np.zeros(0, dtype=ENTRY_DTYPE)
+        self.snapshots = snapshots or []
+        # Ids first seen in the current upload, sorted by key; merged into _entries by save()
+        self._pending = np.zeros(0, dtype=ENTRY_DTYPE)
+
+    @staticmethod
+    def _lookup(entries: np.ndarray, keys: np.ndarray):
+        """Positions in ``entries`` of ``keys`` and which of them were found."""
+        stored = entries["key"]
+        if not len(stored):
+            return np.zeros(len(keys), dtype=np.intp), np.zeros(len(keys), dtype=bool)
+        positions = np.minimum(np.searchsorted(stored, keys), len(stored) - 1)
+        return positions, stored[positions] == keys
+
+    def _check(self, has_id: np.ndarray, keys: np.ndarray, fingerprints: np.ndarray) -> np.ndarray:
+        status = np.full(len(keys), INSERTED, dtype=np.int8)
+        for entries in (self._entries, self._pending):
+            rows = np.flatnonzero(has_id & (status == INSERTED))
+            positions, found = self._lookup(entries, keys[rows])
+            same = entries["fingerprint"][positions[found]] == fingerprints[rows[found]]
+            status[rows[found]] = np.where(same, DUPLICATE, CONFLICT)
+
+        # Ids new to the index may still repeat within this batch: the first
+        # row of each id is inserted, later rows are compared against it
+        rows = np.flatnonzero(has_id & (status == INSERTED))
+        new_keys, first, groups = np.unique(keys[rows], return_index=True, return_inverse=True)
+        first_rows = rows[first]
+        repeats = rows != first_rows[groups]
+        same = fingerprints[rows] == fingerprints[first_rows[groups]]
+        status[rows[repeats]] = np.where(same[repeats], DUPLICATE, CONFLICT)
+
+        new = np.zeros(len(new_keys), dtype=ENTRY_DTYPE)
+        new["key"] = new_keys
+        new["fingerprint"] = fingerprints[first_rows]
+        self._pending = np.insert(self._pending, np.searchsorted(self._pending["key"], new_keys), new)
+        return status
+
+    def check_records(self, records: Union[pd.DataFrame, List[dict]]) -> np.ndarray:
+        """
+        Classify a chunk of parsed rows as ``INSERTED``, ``DUPLICATE`` or ``CONFLICT``.
+
+        Rows without a ``Transaction_ID`` cannot be matched and are always
+        inserted. New ids are remembered, so a later repeat is a duplicate.
+        """
+        frame = as_frame(records)
+        rows = len(frame)
+
+        def text(name: str) -> np.ndarray:
+            if name not in frame.columns:
+                return np.full(rows, "", dtype=object)
+            return to_text_array(frame[name])
+
+        ids = pd.Series(text("Transaction_ID"), dtype=object).str.strip()
+        amounts = to_amounts(frame["Amount"]) if "Amount" in frame.columns else np.full(rows, np.nan)
+        days = to_day_ordinals(frame["Date"]) if "Date" in frame.columns else np.full(rows, DATE_NULL, dtype=np.int32)
+        keys, fingerprints = _row_hashes(ids.to_numpy(), text("Donor_Name"), amounts, days, text("Payment_Method"))
+        return self._check((ids != "").to_numpy(), keys, fingerprints)
+
+    def check_snapshot(self, snapshot: Snapshot) -> np.ndarray:
+        """Like ``check_records`` for the rows of an existing snapshot."""
+        rows = len(snapshot)
+        if "Transaction_ID" not in snapshot.columns:
+            return np.full(rows, INSERTED, dtype=np.int8)
+
+        def text(name: str) -> List[Optional[str]]:
+            if name not in snapshot.columns:
+                return [None] * rows
+            return snapshot.column(name).to_list()
+
+        ids = pd.Series(text("Transaction_ID"), dtype=object).fillna("").str.strip()
+        amounts = snapshot.amount if "Amount" in snapshot.columns else np.full(rows, np.nan)
+        days = snapshot.dates if "Date" in snapshot.columns else np.full(rows, DATE_NULL, dtype=np.int32)
+        keys, fingerprints = _row_hashes(ids.to_numpy(), text("Donor_Name"), amounts, days, text("Payment_Method"))
+        return self._check((ids != "").to_numpy(), keys, fingerprints)
+
+    def merge_pending(self):
+        if not len(self._pending):
+            return
+        positions = np.searchsorted(self._entries["key"], self._pending["key"])
+        self._entries = np.insert(self._entries, positions, self._pending)
+        self._pending = np.zeros(0, dtype=ENTRY_DTYPE)
+
+    @classmethod
+    def load(cls, data_dir: str = DATA_DIR) -> "TransactionIndex":
+        """
+        Load the index and fold in any snapshot it does not cover yet.
+
+        Snapshots are folded in oldest first, so the first upload to use an
+        id wins. A missing index, or one written with other hashing, is built
+        from all existing snapshots.
+        """
+        index = cls()
+        try:
+            with np.load(index_path(data_dir)) as stored:
+                if "version" in stored and int(stored["version"]) == INDEX_VERSION:
+                    index = cls(stored["entries"], stored["snapshots"].tolist())
+        except FileNotFoundError:
+            pass
+        covered = set(index.snapshots)
+        for entry in reversed(SnapshotCatalog(data_dir).entries()):
+            if entry["filename"] not in covered:
+                index.check_snapshot(Snapshot.open(os.path.join(data_dir, entry["filename"])))
+                index.snapshots.append(entry["filename"])
+        return index
+
+    def save(self, data_dir: str = DATA_DIR):
+        self.merge_pending()
+        path = index_path(data_dir)
+        tmp_path = f"{path}.part"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f, version=INDEX_VERSION, entries=self._entries, snapshots=np.array(self.snapshots, dtype=str),
+            )
+        os.replace(tmp_path, path)
+
+
+def index_path(data_dir: str = DATA_DIR) -> str:
+    return os.path.join(data_dir, INDEX_NAME)
+
+
+@contextmanager
+def transaction_index(data_dir: str = DATA_DIR):
+    """
+    Hold the index lock for one append, yielding the loaded index.
+
+    Appends are serialized so two overlapping uploads cannot both insert
+    the same id. Callers record their snapshot in ``snapshots`` and call
+    ``save()`` once it is committed; if they fail before that, nothing they
+    checked is remembered.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    with file_lock(os.path.join(data_dir, ".transactions.lock")):
+        yield TransactionIndex.load(data_dir)
@@ -0,0 +1,128 @@
+"""
+Server-Sent Events push of dashboard updates.
+
+``/dashboard-events`` keeps a connection open per admin page or wall display.
+Every connection subscribes to the process-wide ``dashboard_events``
+broadcaster, which computes the dashboard payload once per upload and hands
+the same encoded event to every subscriber, so ten open tabs cost one
+aggregation, not ten refetches.
+
+Each subscriber has a one-slot queue: a client that has not read the last
+event yet simply gets the newest one instead, since an event carries the
+full aggregate payload rather than a delta.
+
+Streams end after ``DASHBOARD_EVENTS_MAX_SECONDS``; the browser reconnects
+on its own, which re-checks the token and resends the current payload.
+"""
+import asyncio
+import json
+import os
+import threading
+from typing import AsyncIterator, Dict, Optional, Set
+
+from app.aggregates import empty_dashboard
+from app.dashboard import SCOPES, dashboard_data
+
+
+# Comment lines sent on idle connections so proxies do not time them out
+DASHBOARD_EVENTS_KEEPALIVE_SECONDS = float(os.getenv("DASHBOARD_EVENTS_KEEPALIVE_SECONDS", "15"))
+KEEPALIVE = b": keep-alive\n\n"
+DASHBOARD_EVENTS_MAX_SECONDS = float(os.getenv("DASHBOARD_EVENTS_MAX_SECONDS", "300"))
+# Reconnect delay the browser is told to use once a stream ends
+RETRY = b"retry: 1000\n\n"
+
+
+def encode_event(event_id: int, event: str, data: dict) -> bytes:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+class DashboardBroadcaster:
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {scope: set() for scope in SCOPES}
+        # Last event per scope, sent to new subscribers straight away
+        self._events: Dict[str, bytes] = {}
+        self._event_id = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self):
+        """Bind to the running event loop; called on application startup."""
+        self._loop = asyncio.get_running_loop()
+        self._closed = False
+
+    def close(self):
+        """End every open stream so the server can shut down."""
+        self._closed = True
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._offer(queue, None)
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def _encode(self, scope: str) -> bytes:
+        summary = dashboard_data(scope)
+        with self._lock:
+            self._event_id += 1
+            event = encode_event(self._event_id, "aggregates", {
+                "scope": scope,
+                "data": summary if summary is not None else empty_dashboard(),
+            })
+            self._events[scope] = event
+        return event
+
+    def publish(self):
+        """
+        Recompute the payload of every scope that has subscribers and push it.
+
+        Runs as an upload listener in a worker thread; the fan-out itself is
+        handed to the event loop.
+        """
+        if self._loop is None:
+            return
+        # Dropped first: a stream that starts from here on computes its own
+        self._events.clear()
+        for scope in SCOPES:
+            if self._subscribers[scope]:
+                event = self._encode(scope)
+                self._loop.call_soon_threadsafe(self._fan_out, scope, event)
+
+    def _fan_out(self, scope: str, event: bytes):
+        for queue in self._subscribers[scope]:
+            self._offer(queue, event)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: Optional[bytes]):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+    async def stream(self, scope: str) -> AsyncIterator[bytes]:
+        """Yield the current payload for ``scope``, then one event per upload."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + DASHBOARD_EVENTS_MAX_SECONDS
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._subscribers[scope].add(queue)
+        try:
+            event = self._events.get(scope)
+            if event is None:
+                event = await loop.run_in_executor(None, self._encode, scope)
+            yield RETRY + event
+            while not self._closed:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+                try:
+                    event = await asyncio.wait_for(queue.get(), min(remaining, DASHBOARD_EVENTS_KEEPALIVE_SECONDS))
+                except asyncio.TimeoutError:
+                    yield KEEPALIVE
+                    continue
+                if event is None:
+                    return
+                yield event
+        finally:
+            self._subscribers[scope].discard(queue)
+
+
+dashboard_events = DashboardBroadcaster()
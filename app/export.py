@@ -0,0 +1,194 @@
+"""
+Streaming export of stored donations.
+
+Rows are read from the snapshots in batches of ``EXPORT_BATCH_ROWS`` and
+encoded batch by batch, so memory use depends on the batch size, not on the
+number of rows exported. Filters are applied per snapshot with vectorized
+masks over the date and payment-method columns before any row is decoded.
+
+CSV and NDJSON are produced as the response is sent. XLSX cannot be
+streamed while it is written (the workbook is a zip archive finished at
+save), so it is written row by row in openpyxl's write-only mode to a
+temporary file under ``data/.incoming``, which is then streamed and removed.
+"""
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import date
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+from openpyxl import Workbook
+
+from app.catalog import catalog
+from app.ingest import INCOMING_DIR, UPLOAD_READ_SIZE
+from app.snapshot import (
+    AMOUNT_COLUMN, DATA_DIR, DATE_COLUMN, DATE_NULL, DictionaryColumn, Snapshot,
+)
+
+
+EXPORT_BATCH_ROWS = 5000
+# Excel's row limit, header included; longer exports continue on a new sheet
+XLSX_MAX_ROWS = 1_048_576
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+class ExportQuery:
+    """The snapshots and filters of one export."""
+
+    def __init__(
+        self,
+        filenames: List[str],
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        payment_methods: Optional[Sequence[str]] = None,
+        data_dir: str = DATA_DIR,
+    ):
+        if start is not None and end is not None and start > end:
+            raise ValueError("start must not be after end")
+        self.paths = [os.path.join(data_dir, filename) for filename in filenames]
+        self.start = start
+        self.end = end
+        self.payment_methods = {m.strip().lower() for m in payment_methods} if payment_methods else None
+
+    @classmethod
+    def for_scope(cls, scope: str = "latest", filename: Optional[str] = None, **filters) -> "ExportQuery":
+        """
+        Select one upload by ``filename``, the newest upload, or every upload
+        (``scope="history"``, oldest first). Raises ``LookupError`` for a
+        filename that is not in the manifest.
+        """
+        entries = catalog.entries()
+        if filename is not None:
+            if filename not in {entry["filename"] for entry in entries}:
+                raise LookupError(f"Unknown upload: {filename}")
+            return cls([filename], **filters)
+        if scope == "history":
+            return cls([entry["filename"] for entry in reversed(entries)], **filters)
+        return cls([entries[0]["filename"]] if entries else [], **filters)
+
+    def columns(self) -> List[str]:
+        """Columns of the selected snapshots in first-seen order."""
+        columns = {}
+        for path in self.paths:
+            columns.update(dict.fromkeys(Snapshot.open(path).columns))
+        return list(columns)
+
+    def _selected(self, snapshot: Snapshot) -> np.ndarray:
+        selected = np.ones(len(snapshot), dtype=bool)
+        if self.start is not None or self.end is not None:
+            if DATE_COLUMN not in snapshot.columns:
+                return np.zeros(len(snapshot), dtype=bool)
+            days = snapshot.dates
+            selected &= days != DATE_NULL
+            if self.start is not None:
+                selected &= days >= (self.start - date(1970, 1, 1)).days
+            if self.end is not None:
+                selected &= days <= (self.end - date(1970, 1, 1)).days
+        if self.payment_methods is not None:
+            if "Payment_Method" not in snapshot.columns:
+                return np.zeros(len(snapshot), dtype=bool)
+            methods = snapshot.column("Payment_Method")
+            matching = [
+                code for code in range(len(methods.values))
+                if methods.values[code].strip().lower() in self.payment_methods
+            ]
+            selected &= np.isin(methods.codes, matching)
+        return selected
+
+    def batches(self, columns: List[str]) -> Iterator[List[list]]:
+        """Yield the selected rows as lists of values in ``columns`` order."""
+        for path in self.paths:
+            snapshot = Snapshot.open(path)
+            rows = np.flatnonzero(self._selected(snapshot))
+            present = set(snapshot.columns)
+            for start in range(0, len(rows), EXPORT_BATCH_ROWS):
+                batch = rows[start:start + EXPORT_BATCH_ROWS]
+                values = [
+                    _column_values(snapshot, name, batch) if name in present else [None] * len(batch)
+                    for name in columns
+                ]
+                yield [list(row) for row in zip(*values)]
+
+
+def _column_values(snapshot: Snapshot, name: str, rows: np.ndarray) -> list:
+    column = snapshot.column(name)
+    if name == AMOUNT_COLUMN:
+        amounts = column[rows]
+        return np.where(np.isnan(amounts), None, amounts).tolist()
+    if name == DATE_COLUMN:
+        days = column[rows]
+        iso = days.astype("datetime64[D]").astype(str).astype(object)
+        iso[days == DATE_NULL] = None
+        return iso.tolist()
+    if isinstance(column, DictionaryColumn):
+        codes = column.codes[rows]
+        decoded = {code: column.decode(code) for code in np.unique(codes).tolist()}
+        return [decoded[code] for code in codes.tolist()]
+    return [column[i] or None for i in rows.tolist()]
+
+
+def iter_csv(query: ExportQuery) -> Iterator[bytes]:
+    columns = query.columns()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in query.batches(columns):
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_ndjson(query: ExportQuery) -> Iterator[bytes]:
+    columns = query.columns()
+    for batch in query.batches(columns):
+        yield "".join(json.dumps(dict(zip(columns, row))) + "\n" for row in batch).encode("utf-8")
+
+
+def iter_xlsx(query: ExportQuery, incoming_dir: str = INCOMING_DIR) -> Iterator[bytes]:
+    columns = query.columns()
+    dates = columns.index(DATE_COLUMN) if DATE_COLUMN in columns else None
+    os.makedirs(incoming_dir, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix=".xlsx", dir=incoming_dir)
+    os.close(fd)
+    try:
+        workbook = Workbook(write_only=True)
+        sheet, sheet_rows = None, XLSX_MAX_ROWS
+        for batch in query.batches(columns):
+            for row in batch:
+                if sheet_rows == XLSX_MAX_ROWS:
+                    sheet = workbook.create_sheet(f"Donations {len(workbook.worksheets) + 1}")
+                    sheet.append(columns)
+                    sheet_rows = 1
+                if dates is not None and row[dates] is not None:
+                    row[dates] = date.fromisoformat(row[dates])
+                sheet.append(row)
+                sheet_rows += 1
+        if sheet is None:
+            workbook.create_sheet("Donations 1").append(columns)
+        workbook.save(path)
+
+        with open(path, "rb") as f:
+            while True:
+                block = f.read(UPLOAD_READ_SIZE)
+                if not block:
+                    break
+                yield block
+    finally:
+        os.remove(path)
+
+
+EXPORTERS = {"csv": iter_csv, "ndjson": iter_ndjson, "xlsx": iter_xlsx}
+
+
+def export_stream(query: ExportQuery, export_format: str) -> Iterator[bytes]:
+    return EXPORTERS[export_format](query)
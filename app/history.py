@@ -0,0 +1,94 @@
+"""
+Aggregates over every upload ("all history").
+
+Each upload contributes a ``PartialAggregate`` that is merged into the
+running history state in ``data/history.partial.json`` as soon as it is
+ingested, so adding an upload costs the size of that upload plus the size of
+the merged donor and date maps, never a re-read of the earlier snapshots.
+The compact result used by the endpoints is written next to it as
+``data/history.aggregates.json``.
+"""
+import json
+import os
+from typing import Optional
+
+from app.aggregates import PartialAggregate
+from app.catalog import SnapshotCatalog, file_lock
+from app.snapshot import DATA_DIR, Snapshot
+
+
+HISTORY_STATE_NAME = "history.partial.json"
+HISTORY_AGGREGATES_NAME = "history.aggregates.json"
+
+
+def history_state_path(data_dir: str = DATA_DIR) -> str:
+    return os.path.join(data_dir, HISTORY_STATE_NAME)
+
+
+def history_aggregates_path(data_dir: str = DATA_DIR) -> str:
+    return os.path.join(data_dir, HISTORY_AGGREGATES_NAME)
+
+
+def _write_json(path: str, data: dict):
+    tmp_path = f"{path}.part"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _read_state(data_dir: str) -> Optional[PartialAggregate]:
+    try:
+        with open(history_state_path(data_dir)) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != PartialAggregate.VERSION:
+        return None
+    return PartialAggregate.from_dict(data)
+
+
+def _write_state(data_dir: str, history: PartialAggregate):
+    _write_json(history_state_path(data_dir), history.to_dict())
+    _write_json(history_aggregates_path(data_dir), history.to_aggregates())
+
+
+def _locked(data_dir: str):
+    return file_lock(os.path.join(data_dir, ".history.lock"))
+
+
+def add_to_history(snapshot: Snapshot, data_dir: str = DATA_DIR):
+    """Merge one newly ingested snapshot into the history aggregates."""
+    with _locked(data_dir):
+        history = _read_state(data_dir)
+        if history is None:
+            # First upload, or state from an older version: catch up on all
+            # snapshots, which include this one once it is in the manifest
+            _sync(data_dir)
+            return
+        if snapshot.name in history.snapshots:
+            return
+        _write_state(data_dir, history.merge(PartialAggregate.from_snapshot(snapshot)))
+
+
+def _sync(data_dir: str):
+    """
+    Bring the history state in line with the manifest. Caller holds the lock.
+
+    Snapshots missing from the state are merged in, oldest first. If a
+    snapshot that was merged has since been removed, the state is rebuilt.
+    """
+    filenames = [entry["filename"] for entry in reversed(SnapshotCatalog(data_dir).entries())]
+    history = _read_state(data_dir)
+    if history is None or not set(history.snapshots) <= set(filenames):
+        history = PartialAggregate()
+    merged = set(history.snapshots)
+    for filename in filenames:
+        if filename not in merged:
+            history.merge(PartialAggregate.from_snapshot(Snapshot.open(os.path.join(data_dir, filename))))
+    _write_state(data_dir, history)
+
+
+def sync_history(data_dir: str = DATA_DIR):
+    """Merge snapshots ingested before history tracking existed."""
+    with _locked(data_dir):
+        _sync(data_dir)
@@ -0,0 +1,44 @@
+"""
+HTTP validators and conditional requests.
+
+Endpoints whose content only changes with the uploaded data send an
+``ETag`` and ``Last-Modified``; ``is_not_modified`` tells them when the
+client's copy is still current so they can answer 304 without rendering.
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from starlette.requests import Request
+
+
+def http_date(value: datetime) -> str:
+    """Format a datetime (naive values are local time) as an HTTP date."""
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Whether the request's validators match the current representation.
+
+    ``If-None-Match`` takes precedence over ``If-Modified-Since``, as in
+    RFC 9110; weak and strong tags compare equal.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        opaque = etag.removeprefix("W/")
+        return "*" in tags or any(tag.removeprefix("W/") == opaque for tag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            # Zone-less and "-0000" dates parse as naive; HTTP dates are GMT
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have whole-second precision
+        return last_modified.astimezone(timezone.utc).replace(microsecond=0) <= since
+    return False
@@ -0,0 +1,408 @@
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import IO, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from app.aggregates import compute_aggregates, sidecar_path, write_aggregates
+from app.catalog import SnapshotCatalog, catalog, snapshot_entry
+from app.dedup import CONFLICT, DUPLICATE, INSERTED, transaction_index
+from app.history import add_to_history
+from app.snapshot import DATA_DIR, SNAPSHOT_EXT, SNAPSHOT_PREFIX, Snapshot, SnapshotWriter, as_frame
+from app.sql_store import SQL_STORE_ENABLED, ingest_snapshot
+from app.validation import RowValidator
+
+
+CHUNK_ROWS = 5000
+EXCEL_EXTENSIONS = (".xlsx", ".xls")
+DELIMITED_EXTENSIONS = {".csv": ",", ".tsv": "\t"}
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+UPLOAD_EXTENSIONS = EXCEL_EXTENSIONS + tuple(DELIMITED_EXTENSIONS) + NDJSON_EXTENSIONS
+INCOMING_DIR = os.path.join(DATA_DIR, ".incoming")
+NO_VALID_ROWS = "No valid rows to upload"
+UPLOAD_READ_SIZE = 1024 * 1024
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+
+_ingest_pool: Optional[ProcessPoolExecutor] = None
+# Called in a thread after every successful upload handled by this process
+upload_listeners: List[Callable[[], None]] = []
+
+
+def _frame(rows: List[tuple], columns: List[str]) -> pd.DataFrame:
+    frame = pd.DataFrame(rows, columns=columns, dtype=object)
+    # A repeated header keeps its last column, as a dict of the row would
+    return frame.loc[:, ~frame.columns.duplicated(keep="last")]
+
+
+def iter_excel_chunks(
+    source: Union[str, IO[bytes]],
+    chunk_rows: int = CHUNK_ROWS,
+    sheet: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the rows of a worksheet as DataFrames of ``chunk_rows`` rows.
+
+    Reads the first worksheet unless ``sheet`` names another one. The
+    workbook is opened in openpyxl read-only mode so rows are parsed lazily
+    from the sheet XML instead of building the whole sheet in memory.
+    """
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet] if sheet is not None else workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [
+            str(name) if name is not None else f"Unnamed: {i}"
+            for i, name in enumerate(header)
+        ]
+        width = len(columns)
+
+        chunk = []
+        for row in rows:
+            if not row or all(value is None for value in row):
+                continue
+            row = tuple(row[:width])
+            chunk.append(row + (None,) * (width - len(row)))
+            if len(chunk) >= chunk_rows:
+                yield _frame(chunk, columns)
+                chunk = []
+        if chunk:
+            yield _frame(chunk, columns)
+    finally:
+        workbook.close()
+
+
+def _text_columns(df: pd.DataFrame) -> pd.DataFrame:
+    df.columns = [str(name) for name in df.columns]
+    return df
+
+
+def iter_legacy_excel_chunks(
+    source: Union[str, IO[bytes]],
+    chunk_rows: int = CHUNK_ROWS,
+    sheet: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """Fallback for .xls workbooks, which openpyxl cannot stream."""
+    df = _text_columns(pd.read_excel(source, sheet_name=sheet if sheet is not None else 0))
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].reset_index(drop=True)
+
+
+def iter_delimited_chunks(
+    source: Union[str, IO[bytes]],
+    sep: str = ",",
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the rows of a CSV/TSV file as DataFrames of ``chunk_rows`` rows.
+
+    Parsed by pandas' C reader in chunks, with every field kept as text so
+    values such as phone numbers and ids are not reinterpreted; typing is
+    left to the validation stage, which works on the columns as they are.
+    """
+    reader = pd.read_csv(
+        source, sep=sep, dtype=object, encoding="utf-8-sig", chunksize=chunk_rows, skip_blank_lines=True
+    )
+    with reader:
+        for df in reader:
+            # A header-only file reads as one empty frame
+            if len(df):
+                yield _text_columns(df)
+
+
+def iter_ndjson_chunks(source: Union[str, IO[bytes]], chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Yield the objects of a newline-delimited JSON file as DataFrames of ``chunk_rows`` rows."""
+    reader = pd.read_json(source, lines=True, chunksize=chunk_rows, dtype=False, convert_dates=False)
+    with reader:
+        for df in reader:
+            yield _text_columns(df)
+
+
+def iter_upload_chunks(
+    source: Union[str, IO[bytes]],
+    filename: str,
+    sheet: Optional[str] = None,
+) -> Iterator[pd.DataFrame]:
+    """Pick the reader for an upload based on its file extension."""
+    extension = os.path.splitext(filename.lower())[1]
+    if extension in DELIMITED_EXTENSIONS:
+        return iter_delimited_chunks(source, DELIMITED_EXTENSIONS[extension])
+    if extension in NDJSON_EXTENSIONS:
+        return iter_ndjson_chunks(source)
+    if extension == ".xlsx":
+        return iter_excel_chunks(source, sheet=sheet)
+    return iter_legacy_excel_chunks(source, sheet=sheet)
+
+
+def new_snapshot_name() -> str:
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    unique_id = str(uuid.uuid4())[:8]
+    return f"{SNAPSHOT_PREFIX}{timestamp}_{unique_id}{SNAPSHOT_EXT}"
+
+
+def _report_progress(progress_path: Optional[str], rows: int):
+    if progress_path:
+        with open(progress_path, "w") as f:
+            f.write(str(rows))
+
+
+def ingest_excel(
+    source: Union[str, IO[bytes]],
+    original_filename: str,
+    data_dir: str = DATA_DIR,
+    progress_path: Optional[str] = None,
+    append: bool = False,
+    content_hash: Optional[str] = None,
+) -> dict:
+    """
+    Stream an uploaded workbook, CSV/TSV or NDJSON file into a new snapshot in ``data_dir``.
+
+    Only one chunk of rows is held in memory at a time, so peak memory does
+    not grow with the number of rows in the workbook. A chunk stays a
+    DataFrame from the reader through validation into the snapshot writer,
+    so rows are handled column by column, never as one dict each. When ``progress_path``
+    is given, the running row count is written there after every chunk.
+
+    With ``append`` only rows whose ``Transaction_ID`` is not already known
+    are written; the result also reports the inserted, duplicate and
+    conflicting row counts. If no row is new, no snapshot is created, and
+    likewise if the file has no valid rows at all: ``filename`` is then
+    ``None``.
+
+    Rows are validated and normalized before they are written; the number
+    of rejected rows and the first errors are reported in the result.
+
+    ``content_hash`` is recorded in the manifest so a later upload of the
+    same file can be answered with this snapshot.
+    """
+    validator = RowValidator()
+    chunks = (validator(chunk) for chunk in iter_upload_chunks(source, original_filename))
+    result = ingest_chunks(chunks, original_filename, data_dir, progress_path, append, content_hash)
+    result.update(validator.report())
+    return result
+
+
+def ingest_chunks(
+    chunks: Iterable[Union[pd.DataFrame, List[dict]]],
+    source_name: str,
+    data_dir: str = DATA_DIR,
+    progress_path: Optional[str] = None,
+    append: bool = False,
+    content_hash: Optional[str] = None,
+) -> dict:
+    """
+    Write already validated chunks of rows (DataFrames, or lists of dicts)
+    as a new snapshot; see ``ingest_excel``.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    if not append:
+        def write_all(writer: SnapshotWriter):
+            for chunk in chunks:
+                writer.write(chunk)
+                _report_progress(progress_path, writer.records_count)
+        # A file whose rows were all rejected must not replace the latest upload
+        return _write_snapshot(write_all, source_name, data_dir, skip_empty=True, content_hash=content_hash)
+
+    with transaction_index(data_dir) as index:
+        counts = {"inserted": 0, "duplicates": 0, "conflicts": 0}
+
+        def write_new(writer: SnapshotWriter):
+            rows_read = 0
+            for chunk in chunks:
+                chunk = as_frame(chunk)
+                status = index.check_records(chunk)
+                _count_statuses(counts, status)
+                rows_read += len(chunk)
+                writer.write(chunk[status == INSERTED])
+                _report_progress(progress_path, rows_read)
+
+        result = _write_snapshot(write_new, source_name, data_dir, skip_empty=True)
+        _record_appended(index, counts, result, data_dir)
+    result.update(counts)
+    return result
+
+
+def ingest_snapshots(paths: List[str], source_name: str, data_dir: str = DATA_DIR, append: bool = False) -> dict:
+    """
+    Write the rows of existing snapshots, in order, as one new snapshot.
+
+    The typed column buffers are concatenated as they are, so no row is
+    turned back into a dict or re-encoded. ``append`` works as in
+    ``ingest_chunks``.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    if not append:
+        def write_all(writer: SnapshotWriter):
+            for path in paths:
+                writer.write_snapshot_rows(Snapshot.open(path))
+        return _write_snapshot(write_all, source_name, data_dir, skip_empty=True)
+
+    with transaction_index(data_dir) as index:
+        counts = {"inserted": 0, "duplicates": 0, "conflicts": 0}
+
+        def write_new(writer: SnapshotWriter):
+            for path in paths:
+                snapshot = Snapshot.open(path)
+                status = index.check_snapshot(snapshot)
+                _count_statuses(counts, status)
+                writer.write_snapshot_rows(snapshot, np.flatnonzero(status == INSERTED))
+
+        result = _write_snapshot(write_new, source_name, data_dir, skip_empty=True)
+        _record_appended(index, counts, result, data_dir)
+    result.update(counts)
+    return result
+
+
+def _count_statuses(counts: dict, status: np.ndarray):
+    counts["duplicates"] += int(np.count_nonzero(status == DUPLICATE))
+    counts["conflicts"] += int(np.count_nonzero(status == CONFLICT))
+
+
+def _record_appended(index, counts: dict, result: dict, data_dir: str):
+    counts["inserted"] = result["records_count"]
+    if result["filename"]:
+        index.snapshots.append(result["filename"])
+    index.save(data_dir)
+
+
+def _write_snapshot(
+    fill: Callable[[SnapshotWriter], None],
+    original_filename: str,
+    data_dir: str,
+    skip_empty: bool = False,
+    content_hash: Optional[str] = None,
+) -> dict:
+    """Store the rows ``fill`` writes into a new snapshot and register it."""
+    filename = new_snapshot_name()
+    file_path = os.path.join(data_dir, filename)
+
+    writer = SnapshotWriter(file_path, {"source": original_filename})
+    try:
+        fill(writer)
+    except Exception:
+        writer.abort()
+        raise
+    if skip_empty and not writer.records_count:
+        writer.abort()
+        return {"filename": None, "records_count": 0, "file_path": None}
+    writer.close()
+    snapshot = Snapshot.open(file_path)
+    # The sidecar must exist before the manifest points readers at the snapshot
+    write_aggregates(file_path, compute_aggregates(snapshot))
+    if SQL_STORE_ENABLED:
+        # Before the manifest entry: once the upload's hash is recorded a
+        # retry of the same file is answered as already uploaded
+        try:
+            ingest_snapshot(file_path)
+        except Exception:
+            for path in (file_path, sidecar_path(file_path)):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            raise
+    SnapshotCatalog(data_dir).add(
+        snapshot_entry(file_path, writer.records_count, writer.total_amount, content_hash=content_hash)
+    )
+    add_to_history(snapshot, data_dir)
+
+    return {
+        "filename": filename,
+        "records_count": writer.records_count,
+        "file_path": file_path,
+    }
+
+
+def get_ingest_pool() -> ProcessPoolExecutor:
+    """Return the shared ingest process pool, creating it on first use."""
+    global _ingest_pool
+    if _ingest_pool is None:
+        # spawn rather than fork: the parent runs an event loop and threads
+        _ingest_pool = ProcessPoolExecutor(
+            max_workers=max(1, INGEST_WORKERS),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _ingest_pool
+
+
+def shutdown_ingest_pool():
+    global _ingest_pool
+    if _ingest_pool is not None:
+        _ingest_pool.shutdown(wait=True, cancel_futures=True)
+        _ingest_pool = None
+
+
+def notify_uploaded():
+    """
+    Tell this process that an ingest worker committed a new snapshot.
+
+    The worker rewrote the manifest, so the throttled in-memory copy is
+    dropped at once; listeners then run in the default thread pool without
+    delaying the upload response.
+    """
+    catalog.invalidate()
+    loop = asyncio.get_running_loop()
+    for listener in upload_listeners:
+        loop.run_in_executor(None, listener)
+
+
+async def stage_upload(upload, incoming_dir: str = INCOMING_DIR) -> Tuple[str, str]:
+    """
+    Copy an ``UploadFile`` to a file on disk so a worker process can open it.
+
+    The body is copied in fixed-size blocks and hashed as it streams through.
+    Returns the staged path, which the caller owns, and the SHA-256 hex digest.
+    """
+    os.makedirs(incoming_dir, exist_ok=True)
+    suffix = os.path.splitext(upload.filename or "")[1]
+    fd, staged_path = tempfile.mkstemp(suffix=suffix, dir=incoming_dir)
+    digest = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                block = await upload.read(UPLOAD_READ_SIZE)
+                if not block:
+                    break
+                digest.update(block)
+                out.write(block)
+    except Exception:
+        os.remove(staged_path)
+        raise
+    return staged_path, digest.hexdigest()
+
+
+async def run_ingest(
+    staged_path: str,
+    original_filename: str,
+    progress_path: Optional[str] = None,
+    append: bool = False,
+    content_hash: Optional[str] = None,
+) -> dict:
+    """
+    Parse a staged upload and write its snapshot in the ingest process pool.
+
+    The event loop only awaits the result, so other requests keep being served
+    while a large workbook is being parsed.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        result = await loop.run_in_executor(
+            get_ingest_pool(), ingest_excel,
+            staged_path, original_filename, DATA_DIR, progress_path, append, content_hash,
+        )
+        if result["filename"]:
+            notify_uploaded()
+        return result
+    finally:
+        if os.path.exists(staged_path):
+            os.remove(staged_path)
@@ -0,0 +1,152 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Optional
+
+from app.ingest import INGEST_WORKERS, NO_VALID_ROWS, run_ingest
+
+
+UPLOAD_JOB_WORKERS = int(os.getenv("UPLOAD_JOB_WORKERS", str(INGEST_WORKERS)))
+UPLOAD_QUEUE_DEPTH = int(os.getenv("UPLOAD_QUEUE_DEPTH", "16"))
+UPLOAD_JOB_HISTORY = 200
+
+
+class QueueFullError(Exception):
+    """Raised when the upload queue is already at its maximum depth."""
+
+
+class UploadJob:
+    def __init__(self, staged_path: str, filename: str, append: bool = False, content_hash: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.filename = filename
+        self.append = append
+        self.content_hash = content_hash
+        self.staged_path = staged_path
+        self.progress_path = f"{staged_path}.progress"
+        self.state = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.rows_processed = 0
+        self.result: Optional[dict] = None
+        self.errors: List[str] = []
+
+    def _read_progress(self):
+        # The worker process rewrites this file after every chunk it ingests
+        try:
+            with open(self.progress_path) as f:
+                self.rows_processed = int(f.read() or 0)
+        except (OSError, ValueError):
+            pass
+
+    def to_dict(self) -> dict:
+        if self.state == "running":
+            self._read_progress()
+
+        rows_per_second = 0.0
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+            if elapsed > 0:
+                rows_per_second = round(self.rows_processed / elapsed, 1)
+
+        return {
+            "job_id": self.id,
+            "filename": self.filename,
+            "state": self.state,
+            "rows_processed": self.rows_processed,
+            "rows_per_second": rows_per_second,
+            "errors": self.errors,
+            "result": self.result,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class UploadJobQueue:
+    """
+    Bounded queue of background ingest jobs.
+
+    A fixed number of worker tasks pull staged uploads off the queue and await
+    the ingest process pool. ``submit`` refuses work once ``max_depth`` jobs
+    are waiting so a burst of uploads cannot pile up unbounded staged files.
+    """
+    def __init__(self, workers: int = UPLOAD_JOB_WORKERS, max_depth: int = UPLOAD_QUEUE_DEPTH):
+        self.workers = max(1, workers)
+        self.max_depth = max(1, max_depth)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, UploadJob]" = OrderedDict()
+
+    def start(self):
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_depth)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def is_full(self) -> bool:
+        self.start()
+        return self._queue.full()
+
+    def submit(
+        self, staged_path: str, filename: str, append: bool = False, content_hash: Optional[str] = None
+    ) -> UploadJob:
+        self.start()
+        job = UploadJob(staged_path, filename, append, content_hash)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError("Upload queue is full")
+        self._jobs[job.id] = job
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[UploadJob]:
+        return self._jobs.get(job_id)
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished_at is not None]
+        for job_id in finished[:max(0, len(self._jobs) - UPLOAD_JOB_HISTORY)]:
+            del self._jobs[job_id]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: UploadJob):
+        job.state = "running"
+        job.started_at = time.time()
+        try:
+            job.result = await run_ingest(
+                job.staged_path, job.filename, progress_path=job.progress_path,
+                append=job.append, content_hash=job.content_hash,
+            )
+            job._read_progress()
+            if not job.append and not job.result["filename"]:
+                job.errors.append(NO_VALID_ROWS)
+                job.state = "failed"
+            else:
+                job.state = "succeeded"
+        except Exception as e:
+            job._read_progress()
+            job.errors.append(str(e))
+            job.state = "failed"
+        finally:
+            job.finished_at = time.time()
+            if os.path.exists(job.progress_path):
+                os.remove(job.progress_path)
+
+
+upload_jobs = UploadJobQueue()
@@ -1,14 +1,21 @@
 from typing import Optional, Tuple
+from urllib.parse import parse_qsl
 from starlette.types import ASGIApp, Receive, Scope, Send
 from app.security import verify_access_token
 
 
 PROTECTED_PREFIXES = ("/admin",)
 EXEMPT_PATHS = {"/healthz", "/auth/login", "/auth/validate", "/admin", "/public-dashboard"}
+# EventSource cannot send headers, so these paths also take ?token=
+QUERY_TOKEN_PATHS = {"/dashboard-events"}
 
 class BearerAuthASGIMiddleware:
     """
     Pure ASGI middleware that enforces Bearer JWT auth on protected paths.
+
+    A token sent with any request is verified here, once, and the identity
+    is attached as ``scope["state"]["user"]`` (claims under ``"token"``), so
+    handlers and ``get_current_user`` read it without decoding again.
     """
     def __init__(self, app: ASGIApp):
         self.app = app
@@ -19,25 +26,17 @@ class BearerAuthASGIMiddleware:
 
         path: str = scope.get("path", "")
 
-        if path in EXEMPT_PATHS or not any(path.startswith(p) for p in PROTECTED_PREFIXES):
-            return await self.app(scope, receive, send)
-
         token = self._extract_bearer(scope)
-        if not token:
-            return await self._unauthorized(send)
-
-        payload = verify_access_token(token)
-        if not payload:
+        if not token and path in QUERY_TOKEN_PATHS:
+            token = self._extract_query_token(scope)
+        payload = verify_access_token(token) if token else None
+        if payload and payload.get("sub"):
+            scope.setdefault("state", {})
+            scope["state"]["user"] = payload["sub"]
+            scope["state"]["token"] = payload
+        elif path not in EXEMPT_PATHS and any(path.startswith(p) for p in PROTECTED_PREFIXES):
             return await self._unauthorized(send)
 
-        # (Optional) attach identity to scope for downstream use
-        scope.setdefault("state", {})
-        scope["state"]["user"] = payload.get("sub")
-        
-        # Debug: Print what we're attaching
-        print(f"Middleware: Attaching user {payload.get('sub')} to scope state")
-        print(f"Middleware: Scope state after attachment: {scope.get('state')}")
-
         return await self.app(scope, receive, send)
 
     @staticmethod
@@ -49,6 +48,13 @@ class BearerAuthASGIMiddleware:
                     return auth.split(" ", 1)[1].strip()
         return None
 
+    @staticmethod
+    def _extract_query_token(scope: Scope) -> Optional[str]:
+        for k, v in parse_qsl(scope.get("query_string", b"").decode("latin1")):
+            if k == "token":
+                return v.strip() or None
+        return None
+
     @staticmethod
     async def _unauthorized(send: Send):
         body = b'{"detail":"Unauthorized"}'
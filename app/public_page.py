@@ -0,0 +1,423 @@
+"""
+HTML of the public dashboard.
+
+The page is rendered from the dashboard summary alone, so a rendered copy
+stays valid until the underlying data changes.
+"""
+from datetime import datetime
+
+
+NO_DATA_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Donations Dashboard</title>
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            margin: 0;
+            padding: 20px;
+            min-height: 100vh;
+            color: #333;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background: white;
+            border-radius: 15px;
+            padding: 30px;
+            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+        }
+        .header {
+            text-align: center;
+            margin-bottom: 30px;
+        }
+        .header h1 {
+            color: #333;
+            font-size: 2.5rem;
+            margin-bottom: 10px;
+        }
+        .header p {
+            color: #666;
+            font-size: 1.2rem;
+        }
+        .no-data {
+            text-align: center;
+            padding: 50px;
+            color: #666;
+        }
+        .no-data h2 {
+            color: #333;
+            margin-bottom: 20px;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Donations Dashboard</h1>
+            <p>Transparency in giving</p>
+        </div>
+        <div class="no-data">
+            <h2>No donation data available</h2>
+            <p>Check back later for updates on our donation activities.</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+ERROR_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Donations Dashboard</title>
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            margin: 0;
+            padding: 20px;
+            min-height: 100vh;
+            color: #333;
+        }
+        .container {
+            max-width: 1200px;
+            margin: 0 auto;
+            background: white;
+            border-radius: 15px;
+            padding: 30px;
+            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+        }
+        .header {
+            text-align: center;
+            margin-bottom: 30px;
+        }
+        .header h1 {
+            color: #333;
+            font-size: 2.5rem;
+            margin-bottom: 10px;
+        }
+        .error {
+            text-align: center;
+            padding: 50px;
+            color: #666;
+        }
+        .error h2 {
+            color: #e74c3c;
+            margin-bottom: 20px;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>Donations Dashboard</h1>
+            <p>Transparency in giving</p>
+        </div>
+        <div class="error">
+            <h2>Error Loading Data</h2>
+            <p>We're experiencing technical difficulties. Please try again later.</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+def render_dashboard(summary: dict, updated_at: datetime) -> str:
+    """Render the public dashboard for ``summary`` as last updated at ``updated_at``."""
+    total_donations = summary["total_donations"]
+    total_amount = summary["total_amount"]
+    active_donors = summary["active_donors"]
+    recent_activity = summary["recent_activity"]
+    top_donors = summary["top_donors"]
+    monthly_trend = summary["monthly_trend"]
+    latest_file = summary["data_source"]
+    
+    # Calculate bar heights for monthly trend
+    max_amount = max([month["amount"] for month in monthly_trend]) if monthly_trend else 1
+    trend_bars = []
+    for month in monthly_trend:
+        height = int((month["amount"] / max_amount) * 60) if max_amount > 0 else 0
+        trend_bars.append(f'<div style="display: flex; flex-direction: column; align-items: center;"><div class="trend-bar" style="height: {height}px; width: 20px;" title="{month["month"]}: ${month["amount"]:,.2f}"></div><div class="trend-label">{month["month"]}</div></div>')
+    
+    # Create the HTML content
+    html_content = f"""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Public Donations Dashboard</title>
+        <style>
+            * {{
+                margin: 0;
+                padding: 0;
+                box-sizing: border-box;
+            }}
+            
+            body {{
+                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                background: linear-gradient(135deg, #2E8B57 0%, #3CB371 25%, #20B2AA 50%, #48D1CC 75%, #40E0D0 100%);
+                min-height: 100vh;
+                color: #2c3e50;
+                padding: 15px;
+            }}
+            
+            .container {{
+                max-width: 1000px;
+                margin: 0 auto;
+                background: rgba(255, 255, 255, 0.95);
+                backdrop-filter: blur(15px);
+                border-radius: 20px;
+                padding: 30px;
+                box-shadow: 0 15px 40px rgba(46, 139, 87, 0.25);
+                border: 1px solid rgba(255, 255, 255, 0.3);
+            }}
+            
+            .header {{
+                text-align: center;
+                margin-bottom: 25px;
+                padding-bottom: 20px;
+                border-bottom: 2px solid #3CB371;
+                position: relative;
+            }}
+            
+            .header::before {{
+                content: '🌱';
+                position: absolute;
+                top: 0;
+                right: 25px;
+                font-size: 1.8rem;
+                opacity: 0.3;
+            }}
+            
+            .header h1 {{
+                color: #2E8B57;
+                font-size: 2.2rem;
+                font-weight: 700;
+                margin-bottom: 10px;
+                text-shadow: 1px 1px 2px rgba(0,0,0,0.1);
+            }}
+            
+            .header p {{
+                color: #34495e;
+                font-size: 1rem;
+                font-weight: 500;
+            }}
+            
+            .stats-grid {{
+                display: grid;
+                grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+                gap: 20px;
+                margin-bottom: 25px;
+            }}
+            
+            .stat-card {{
+                background: linear-gradient(135deg, #2E8B57 0%, #3CB371 100%);
+                color: white;
+                padding: 25px;
+                border-radius: 15px;
+                text-align: center;
+                transition: all 0.3s ease;
+                box-shadow: 0 8px 25px rgba(46, 139, 87, 0.25);
+                position: relative;
+                overflow: hidden;
+            }}
+            
+            .stat-card::before {{
+                content: '';
+                position: absolute;
+                top: 0;
+                left: 0;
+                right: 0;
+                height: 3px;
+                background: linear-gradient(90deg, #20B2AA, #48D1CC, #40E0D0);
+            }}
+            
+            .stat-card:hover {{
+                transform: translateY(-5px) scale(1.02);
+                box-shadow: 0 12px 30px rgba(46, 139, 87, 0.35);
+            }}
+            
+            .stat-number {{
+                font-size: 2.5rem;
+                font-weight: 700;
+                margin-bottom: 10px;
+                text-shadow: 1px 1px 2px rgba(0,0,0,0.2);
+            }}
+            
+            .stat-label {{
+                font-size: 0.9rem;
+                text-transform: uppercase;
+                letter-spacing: 1.5px;
+                opacity: 0.9;
+                font-weight: 500;
+            }}
+            
+            .content-section {{
+                background: linear-gradient(135deg, rgba(46, 139, 87, 0.03) 0%, rgba(60, 179, 113, 0.03) 100%);
+                padding: 25px;
+                border-radius: 15px;
+                margin-bottom: 20px;
+                box-shadow: 0 5px 20px rgba(46, 139, 87, 0.1);
+                border: 1px solid rgba(46, 139, 87, 0.08);
+            }}
+            
+            .section-title {{
+                font-size: 1.4rem;
+                margin-bottom: 20px;
+                color: #2E8B57;
+                border-bottom: 2px solid #3CB371;
+                padding-bottom: 10px;
+                font-weight: 600;
+                text-shadow: 1px 1px 1px rgba(0,0,0,0.05);
+            }}
+            
+            .activity-item {{
+                background: rgba(255, 255, 255, 0.8);
+                padding: 15px;
+                margin-bottom: 10px;
+                border-radius: 10px;
+                border-left: 3px solid #2E8B57;
+                box-shadow: 0 2px 8px rgba(46, 139, 87, 0.08);
+                transition: all 0.2s ease;
+                font-size: 0.9rem;
+            }}
+            
+            .activity-item:hover {{
+                transform: translateX(3px);
+                box-shadow: 0 4px 12px rgba(46, 139, 87, 0.15);
+            }}
+            
+            .donor-item {{
+                background: rgba(255, 255, 255, 0.8);
+                padding: 15px;
+                margin-bottom: 10px;
+                border-radius: 10px;
+                display: flex;
+                justify-content: space-between;
+                align-items: center;
+                box-shadow: 0 2px 8px rgba(46, 139, 87, 0.08);
+                transition: all 0.2s ease;
+                font-size: 0.9rem;
+            }}
+            
+            .donor-item:hover {{
+                transform: translateY(-2px);
+                box-shadow: 0 4px 12px rgba(46, 139, 87, 0.15);
+            }}
+            
+            .donor-rank {{
+                font-size: 1.5rem;
+                margin-right: 15px;
+            }}
+            
+            .monthly-trend {{
+                display: flex;
+                align-items: end;
+                gap: 12px;
+                height: 80px;
+                margin-top: 15px;
+            }}
+            
+            .trend-bar {{
+                background: linear-gradient(135deg, #2E8B57 0%, #3CB371 100%);
+                border-radius: 6px 6px 0 0;
+                min-width: 20px;
+                position: relative;
+                transition: all 0.2s ease;
+                box-shadow: 0 2px 8px rgba(46, 139, 87, 0.2);
+            }}
+            
+            .trend-bar:hover {{
+                transform: scaleY(1.1);
+                box-shadow: 0 4px 12px rgba(46, 139, 87, 0.3);
+            }}
+            
+            .trend-label {{
+                font-size: 0.75rem;
+                color: #2E8B57;
+                text-align: center;
+                margin-top: 8px;
+                font-weight: 500;
+            }}
+            
+            .footer {{
+                text-align: center;
+                margin-top: 25px;
+                padding-top: 20px;
+                border-top: 2px solid #3CB371;
+                color: #2E8B57;
+                font-size: 0.85rem;
+                font-weight: 500;
+            }}
+            
+            @media (max-width: 768px) {{
+                .container {{
+                    padding: 20px;
+                }}
+                
+                .header h1 {{
+                    font-size: 1.8rem;
+                }}
+                
+                .stats-grid {{
+                    grid-template-columns: 1fr;
+                }}
+            }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="header">
+                <h1>Donations Dashboard</h1>
+                <p>Transparency in giving - Latest donation activities</p>
+            </div>
+            
+            <div class="stats-grid">
+                <div class="stat-card">
+                    <div class="stat-number">{total_donations:,}</div>
+                    <div class="stat-label">Total Donations</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-number">${total_amount:,.2f}</div>
+                    <div class="stat-label">Total Amount</div>
+                </div>
+                <div class="stat-card">
+                    <div class="stat-number">{active_donors:,}</div>
+                    <div class="stat-label">Active Donors</div>
+                </div>
+            </div>
+            
+            <div class="content-section">
+                <h3 class="section-title">Recent Donations</h3>
+                {''.join([f'<div class="activity-item"><strong>{activity["message"]}</strong><br><small>Date: {activity["date"]}</small></div>' for activity in recent_activity])}
+            </div>
+            
+            <div class="content-section">
+                <h3 class="section-title">Top Donors</h3>
+                {''.join([f'<div class="donor-item"><div><span class="donor-rank">{chr(127941 + i) if i < 3 else "🏅"}</span><strong>{donor["name"]}</strong></div><div>${donor["total"]:,.2f}</div></div>' for i, donor in enumerate(top_donors)])}
+            </div>
+            
+            <div class="content-section">
+                <h3 class="section-title">Monthly Trend</h3>
+                <div class="monthly-trend">
+                    {''.join(trend_bars)}
+                </div>
+            </div>
+            
+            <div class="footer">
+                <p>Last updated: {updated_at.strftime('%B %d, %Y at %I:%M %p')}</p>
+                <p>Data source: {latest_file}</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """
+
+    return html_content
@@ -0,0 +1,120 @@
+"""
+Time-bucketed rollups over the per-day index stored with each snapshot.
+
+``DailyIndex`` keeps prefix sums of the daily totals and counts over the
+days that have donations, so the sum over any date range is two binary
+searches and a rollup costs O(buckets log days) no matter how many rows
+the snapshot covers or how far apart its dates are.
+"""
+from datetime import date, timedelta
+from typing import List, Optional
+
+import numpy as np
+
+from app.snapshot import day_to_iso
+
+
+GRANULARITIES = ("day", "week", "month", "year")
+MAX_BUCKETS = 5000
+
+_EPOCH = date(1970, 1, 1)
+
+
+def _to_day(value: date) -> int:
+    return (value - _EPOCH).days
+
+
+def _period_start(value: date, granularity: str) -> date:
+    if granularity == "week":
+        return value - timedelta(days=value.weekday())
+    if granularity == "month":
+        return value.replace(day=1)
+    if granularity == "year":
+        return value.replace(month=1, day=1)
+    return value
+
+
+def _next_period(value: date, granularity: str) -> date:
+    if granularity == "day":
+        return value + timedelta(days=1)
+    if granularity == "week":
+        return value + timedelta(days=7)
+    if granularity == "month":
+        return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+    return date(value.year + 1, 1, 1)
+
+
+def _period_label(value: date, granularity: str) -> str:
+    if granularity == "week":
+        year, week, _ = value.isocalendar()
+        return f"{year}-W{week:02d}"
+    if granularity == "month":
+        return value.strftime("%Y-%m")
+    if granularity == "year":
+        return str(value.year)
+    return value.isoformat()
+
+
+class DailyIndex:
+    def __init__(self, days: List[int], sums: List[float], counts: List[int]):
+        # Sorted day numbers with donations; prefix[i] holds the total of the first i of them
+        self._days = np.asarray(days, dtype=np.int64)
+        self.days = len(self._days)
+        self._sum_prefix = np.concatenate([[0.0], np.cumsum(sums, dtype=np.float64)])
+        self._count_prefix = np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])
+
+    @classmethod
+    def from_aggregates(cls, aggregates: dict) -> "DailyIndex":
+        daily = aggregates["daily"]
+        return cls(daily["days"], daily["sums"], daily["counts"])
+
+    @property
+    def first_date(self) -> Optional[str]:
+        return day_to_iso(self._days[0]) if self.days else None
+
+    @property
+    def last_date(self) -> Optional[str]:
+        return day_to_iso(self._days[-1]) if self.days else None
+
+    def range_totals(self, first_day: int, end_day: int):
+        """Sum and count over ``[first_day, end_day)`` in O(log days)."""
+        lo, hi = np.searchsorted(self._days, [first_day, end_day])
+        return float(self._sum_prefix[hi] - self._sum_prefix[lo]), int(self._count_prefix[hi] - self._count_prefix[lo])
+
+    def rollup(self, start: Optional[date], end: Optional[date], granularity: str) -> List[dict]:
+        """
+        Bucket the inclusive range ``start``..``end`` by ``granularity``.
+
+        Missing bounds default to the first/last day with data; if that puts
+        the given bound outside the data, there is nothing to bucket. The
+        first and last buckets are clipped to the requested range.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+        if start is not None and end is not None and end < start:
+            raise ValueError("end must not be before start")
+        if not self.days and (start is None or end is None):
+            return []
+        start = start or date.fromisoformat(self.first_date)
+        end = end or date.fromisoformat(self.last_date)
+        if end < start:
+            return []
+
+        buckets = []
+        period = _period_start(start, granularity)
+        while period <= end:
+            if len(buckets) >= MAX_BUCKETS:
+                raise ValueError(f"range produces more than {MAX_BUCKETS} buckets, use a coarser granularity")
+            next_period = _next_period(period, granularity)
+            bucket_start = max(period, start)
+            bucket_end = min(next_period - timedelta(days=1), end)
+            amount, count = self.range_totals(_to_day(bucket_start), _to_day(bucket_end) + 1)
+            buckets.append({
+                "period": _period_label(period, granularity),
+                "start": bucket_start.isoformat(),
+                "end": bucket_end.isoformat(),
+                "amount": round(amount, 2),
+                "count": count,
+            })
+            period = next_period
+        return buckets
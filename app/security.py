@@ -1,7 +1,13 @@
+import asyncio
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
 from jose import jwt, JWTError  # pip install python-jose[cryptography]
 import bcrypt  # if you use password hashes (pip install bcrypt)
@@ -11,6 +17,12 @@ CREDENTIALS_FILE = Path("app/admin_info/login.json")
 JWT_SECRET = "WAITWHATDOYOUMEANWITHTHIS"  # use env var in prod
 JWT_ALG = "HS256"
 JWT_TTL_MIN = 30
+# Verified tokens are remembered for at most this long, and never past their exp
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+# Threads running bcrypt, and logins admitted at once (running plus waiting)
+LOGIN_WORKERS = int(os.getenv("LOGIN_WORKERS", "2"))
+LOGIN_MAX_PENDING = int(os.getenv("LOGIN_MAX_PENDING", str(4 * LOGIN_WORKERS)))
 
 class CredentialStore:
     def __init__(self, file_path: Path):
@@ -30,6 +42,55 @@ class CredentialStore:
 
 creds = CredentialStore(CREDENTIALS_FILE)
 
+
+class LoginBusyError(Exception):
+    """Raised when more logins are in progress than ``LOGIN_MAX_PENDING``."""
+
+
+class PasswordChecker:
+    """
+    Runs password checks off the event loop.
+
+    bcrypt takes a few hundred milliseconds per check by design, so checks
+    run on a small dedicated thread pool. At most ``max_pending`` logins are
+    admitted at a time; further attempts fail at once with
+    ``LoginBusyError`` instead of queueing behind a burst.
+    """
+    def __init__(self, store: CredentialStore, workers: int = LOGIN_WORKERS, max_pending: int = LOGIN_MAX_PENDING):
+        self.store = store
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="login")
+        return self._executor
+
+    async def verify_password(self, username: str, password: str) -> bool:
+        # Checked and counted without awaiting in between, so this is
+        # atomic on the event loop
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise LoginBusyError()
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), self.store.verify_password, username, password,
+            )
+        finally:
+            self.pending -= 1
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_checker = PasswordChecker(creds)
+
 def create_access_token(sub: str, ttl_minutes: int = JWT_TTL_MIN) -> str:
     now = datetime.now(timezone.utc)
     payload = {
@@ -39,9 +100,58 @@ def create_access_token(sub: str, ttl_minutes: int = JWT_TTL_MIN) -> str:
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALG)
 
+class TokenCache:
+    """
+    Bounded LRU of verified token claims.
+
+    Only tokens that verified are cached; an entry is dropped once the
+    token's ``exp`` passes or after ``ttl`` seconds, whichever comes first.
+    """
+    def __init__(self, max_entries: int = TOKEN_CACHE_SIZE, ttl: float = TOKEN_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and now < entry[1]:
+                self._entries.move_to_end(token)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[token]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, payload: dict):
+        expires_at = time.time() + self.ttl
+        if "exp" in payload:
+            expires_at = min(expires_at, float(payload["exp"]))
+        with self._lock:
+            self._entries[token] = (payload, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+token_cache = TokenCache()
+
 def verify_access_token(token: str) -> Optional[dict]:
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG])
-        return payload
     except JWTError:
         return None
+    token_cache.put(token, payload)
+    return payload
@@ -0,0 +1,584 @@
+"""
+Columnar, memory-mappable donation snapshots.
+
+A ``.dsnap`` file is laid out as::
+
+    MAGIC (8 bytes) | header length (uint64, little endian) | JSON header | column buffers
+
+The header lists every column with the byte ranges of its buffers, relative
+to the start of the buffer section. Buffers start on 64-byte boundaries so
+they can be viewed as NumPy arrays straight out of an ``mmap``:
+
+* ``Amount`` is a float64 array (NaN when missing).
+* ``Date`` is an int32 array of days since 1970-01-01 (``DATE_NULL`` when missing).
+* ``Donor_Name``, ``Email`` and ``Payment_Method`` are dictionary encoded:
+  int32 codes (``NULL_CODE`` when missing) plus a string dictionary.
+* Any other column is stored as a string column: int64 end offsets plus
+  concatenated UTF-8 bytes.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import tempfile
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+DATA_DIR = "data"
+MAGIC = b"DSNAP001"
+SNAPSHOT_EXT = ".dsnap"
+LEGACY_EXT = ".json"
+SNAPSHOT_PREFIX = "donations_"
+ALIGNMENT = 64
+
+AMOUNT_COLUMN = "Amount"
+DATE_COLUMN = "Date"
+DICTIONARY_COLUMNS = ("Donor_Name", "Email", "Payment_Method")
+DATE_NULL = np.iinfo(np.int32).min
+NULL_CODE = -1
+# Whether ambiguous non-ISO dates such as 01/02/2024 are read day first
+UPLOAD_DATES_DAYFIRST = os.getenv("UPLOAD_DATES_DAYFIRST", "0") == "1"
+FALLBACK_DATE_FORMATS = ("%d/%m/%Y", "%m/%d/%Y") if UPLOAD_DATES_DAYFIRST else ("%m/%d/%Y", "%d/%m/%Y")
+
+_HEADER_PREFIX = struct.Struct("<8sQ")
+_EPOCH = date(1970, 1, 1)
+
+
+def is_snapshot_file(filename: str) -> bool:
+    # Sidecar files share the prefix but carry a second extension
+    root, ext = os.path.splitext(filename)
+    return filename.startswith(SNAPSHOT_PREFIX) and ext in (SNAPSHOT_EXT, LEGACY_EXT) and "." not in root
+
+
+def list_snapshot_files(data_dir: str) -> List[str]:
+    """
+    Return the snapshot filenames in ``data_dir``, newest first.
+
+    Snapshots are write-once, so mtime is their creation time; the JSON
+    converter carries the original mtime over to the converted file. A
+    ``.json`` snapshot kept next to its converted ``.dsnap`` (``--keep-json``)
+    is the same upload and is left out.
+    """
+    if not os.path.exists(data_dir):
+        return []
+    files = [f for f in os.listdir(data_dir) if is_snapshot_file(f)]
+    converted = {f[:-len(SNAPSHOT_EXT)] for f in files if f.endswith(SNAPSHOT_EXT)}
+    files = [f for f in files if not (f.endswith(LEGACY_EXT) and f[:-len(LEGACY_EXT)] in converted)]
+    files.sort(key=lambda f: os.path.getmtime(os.path.join(data_dir, f)), reverse=True)
+    return files
+
+
+def day_to_iso(day: int) -> str:
+    if day == DATE_NULL:
+        return ""
+    return (_EPOCH + timedelta(days=int(day))).isoformat()
+
+
+def to_day_ordinals(values) -> np.ndarray:
+    """
+    Parse dates/datetimes/date strings into int32 days since the epoch.
+
+    Datetime arrays (such as validated ``Date`` columns) are converted
+    directly. Otherwise ISO dates are parsed first. Values that are not ISO are tried as
+    ``MM/DD/YYYY`` and ``DD/MM/YYYY`` (the other way round with
+    ``UPLOAD_DATES_DAYFIRST``), and anything still left, such as
+    ``Jan 15, 2024``, with pandas' per-value format inference.
+    """
+    if pd.api.types.is_datetime64_any_dtype(getattr(values, "dtype", None)):
+        days = np.asarray(values, dtype="datetime64[D]")
+        out = days.astype(np.int64)
+        out[np.isnat(days)] = DATE_NULL
+        return out.astype(np.int32)
+    series = pd.Series(values, dtype=object)
+    parsed = pd.to_datetime(series, errors="coerce", format="ISO8601")
+    for date_format in FALLBACK_DATE_FORMATS + ("mixed",):
+        missing = parsed.isna() & series.notna()
+        if not missing.any():
+            break
+        parsed[missing] = pd.to_datetime(
+            series[missing], errors="coerce", format=date_format, dayfirst=UPLOAD_DATES_DAYFIRST,
+        )
+    days = parsed.to_numpy(dtype="datetime64[D]")
+    out = days.astype(np.int64)
+    out[np.isnat(days)] = DATE_NULL
+    return out.astype(np.int32)
+
+
+def to_amounts(values) -> np.ndarray:
+    if isinstance(values, pd.Series) and pd.api.types.is_numeric_dtype(values.dtype):
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+
+
+def to_text(value) -> Optional[str]:
+    if value is None or type(value) is str:
+        return value
+    if isinstance(value, float):
+        if value != value:
+            return None
+        if value.is_integer():
+            return str(int(value))
+    if isinstance(value, datetime) and value.time() == datetime.min.time():
+        return value.date().isoformat()
+    return str(value)
+
+
+def to_text_array(values: pd.Series) -> np.ndarray:
+    """``to_text`` over a column, with ``""`` for missing values."""
+    if isinstance(values.dtype, pd.StringDtype) or (
+        values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty")
+    ):
+        return values.fillna("").to_numpy(dtype=object)
+    return values.map(lambda value: to_text(value) or "").to_numpy(dtype=object)
+
+
+def as_frame(records: Union[pd.DataFrame, List[dict]]) -> pd.DataFrame:
+    """A chunk of rows as a DataFrame; lists of dicts are converted."""
+    if isinstance(records, pd.DataFrame):
+        return records
+    return pd.DataFrame(list(records))
+
+
+class _Spool:
+    """Append-only temporary file holding one column buffer while writing."""
+    def __init__(self, tmp_dir: str, registry: list):
+        self.fh = tempfile.TemporaryFile(dir=tmp_dir)
+        self.nbytes = 0
+        registry.append(self)
+
+    def write(self, data: bytes):
+        self.fh.write(data)
+        self.nbytes += len(data)
+
+
+class _StringSpool:
+    def __init__(self, tmp_dir: str, registry: list):
+        self.offsets = _Spool(tmp_dir, registry)
+        self.data = _Spool(tmp_dir, registry)
+        self.offsets.write(np.zeros(1, dtype=np.int64).tobytes())
+        self.count = 0
+
+    def extend(self, values: Iterable[str]):
+        values = list(values)
+        if not values:
+            return
+        joined = "".join(values)
+        data = joined.encode("utf-8")
+        if len(data) == len(joined):
+            # ASCII only: character counts are byte counts
+            lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+        else:
+            lengths = np.fromiter((len(v.encode("utf-8")) for v in values), dtype=np.int64, count=len(values))
+        self.extend_encoded(lengths, data)
+
+    def extend_encoded(self, lengths: np.ndarray, data: bytes):
+        """Append strings given as their UTF-8 byte lengths and concatenated bytes."""
+        self.offsets.write((self.data.nbytes + np.cumsum(lengths, dtype=np.int64)).tobytes())
+        self.data.write(data)
+        self.count += len(lengths)
+
+
+class _DictionarySpool:
+    def __init__(self, tmp_dir: str, registry: list):
+        self.codes = _Spool(tmp_dir, registry)
+        self.lookup: Dict[str, int] = {}
+        self.values = _StringSpool(tmp_dir, registry)
+
+    def extend_text(self, values: np.ndarray):
+        """Append a column of strings (``""`` when missing), one lookup per distinct value."""
+        codes, uniques = pd.factorize(values)
+        mapping = np.empty(len(uniques), dtype=np.int32)
+        new_values = []
+        for i, value in enumerate(uniques.tolist()):
+            code = NULL_CODE if not value else self.lookup.get(value)
+            if code is None:
+                code = self.lookup[value] = len(self.lookup)
+                new_values.append(value)
+            mapping[i] = code
+        self.values.extend(new_values)
+        self.codes.write(mapping[codes].tobytes())
+
+    def extend_codes(self, column: "DictionaryColumn", codes: np.ndarray):
+        """Append codes of another snapshot's dictionary, re-coded into this one."""
+        # The last slot maps NULL_CODE (-1) to itself
+        mapping = np.full(len(column.values) + 1, NULL_CODE, dtype=np.int32)
+        new_values = []
+        for code in np.unique(codes[codes != NULL_CODE]).tolist():
+            value = column.values[code]
+            mapped = self.lookup.get(value)
+            if mapped is None:
+                mapped = self.lookup[value] = len(self.lookup)
+                new_values.append(value)
+            mapping[code] = mapped
+        self.values.extend(new_values)
+        self.codes.write(mapping[codes].tobytes())
+
+
+class SnapshotWriter:
+    """
+    Build a ``.dsnap`` file from chunks of records.
+
+    Chunks arrive as DataFrames and are encoded a column at a time with
+    vectorized conversions. Each column is spooled to its own temporary
+    file as chunks arrive, so only the current chunk and the string
+    dictionaries are held in memory.
+    The finished file is assembled next to ``path`` and renamed into place
+    on ``close()``.
+    """
+    APPEND_BLOCK_ROWS = 1 << 16
+
+    def __init__(self, path: str, metadata: Optional[dict] = None):
+        self.path = path
+        self.records_count = 0
+        self.total_amount = 0.0
+        self.metadata = metadata or {}
+        self._tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".dsnap-")
+        self._spools: List[_Spool] = []
+        self._order: List[str] = []
+        self._columns: Dict[str, object] = {
+            AMOUNT_COLUMN: _Spool(self._tmp_dir, self._spools),
+            DATE_COLUMN: _Spool(self._tmp_dir, self._spools),
+        }
+        for name in DICTIONARY_COLUMNS:
+            self._columns[name] = _DictionarySpool(self._tmp_dir, self._spools)
+
+    def _column(self, name: str):
+        if name not in self._order:
+            self._order.append(name)
+        spool = self._columns.get(name)
+        if spool is None:
+            # Column first seen mid-stream: earlier rows had no value for it
+            spool = self._columns[name] = _StringSpool(self._tmp_dir, self._spools)
+            spool.extend([""] * self.records_count)
+        return spool
+
+    def write(self, records: Union[pd.DataFrame, List[dict]]):
+        """Append a chunk of rows, given as a DataFrame or a list of dicts."""
+        frame = as_frame(records)
+        rows = len(frame)
+        if not rows:
+            return
+        for name in frame.columns:
+            self._column(name)
+
+        for name, spool in self._columns.items():
+            present = name in frame.columns
+            if name == AMOUNT_COLUMN:
+                amounts = to_amounts(frame[name]) if present else np.full(rows, np.nan)
+                self.total_amount += float(np.nansum(amounts))
+                spool.write(amounts.tobytes())
+            elif name == DATE_COLUMN:
+                days = to_day_ordinals(frame[name]) if present else np.full(rows, DATE_NULL, dtype=np.int32)
+                spool.write(days.tobytes())
+            elif isinstance(spool, _DictionarySpool):
+                if present:
+                    spool.extend_text(to_text_array(frame[name]))
+                else:
+                    spool.codes.write(np.full(rows, NULL_CODE, dtype=np.int32).tobytes())
+            elif present:
+                spool.extend(to_text_array(frame[name]))
+            else:
+                spool.extend_encoded(np.zeros(rows, dtype=np.int64), b"")
+        self.records_count += rows
+
+    def write_snapshot_rows(self, snapshot: "Snapshot", rows: Optional[np.ndarray] = None):
+        """
+        Append rows of another snapshot, all of them unless ``rows`` selects some.
+
+        Works on the typed buffers directly: amounts and dates are copied,
+        dictionary codes re-coded and string bytes sliced, ``APPEND_BLOCK_ROWS``
+        rows at a time, without building a dict per row.
+        """
+        if rows is None:
+            rows = np.arange(len(snapshot))
+        for name in snapshot.columns:
+            self._column(name)
+        for start in range(0, len(rows), self.APPEND_BLOCK_ROWS):
+            block = rows[start:start + self.APPEND_BLOCK_ROWS]
+            for name, spool in self._columns.items():
+                present = name in snapshot.columns
+                if name == AMOUNT_COLUMN:
+                    amounts = snapshot.amount[block] if present else np.full(len(block), np.nan)
+                    self.total_amount += float(np.nansum(amounts))
+                    spool.write(amounts.tobytes())
+                elif name == DATE_COLUMN:
+                    days = snapshot.dates[block] if present else np.full(len(block), DATE_NULL, dtype=np.int32)
+                    spool.write(days.tobytes())
+                elif isinstance(spool, _DictionarySpool):
+                    if present:
+                        column = snapshot.column(name)
+                        spool.extend_codes(column, column.codes[block])
+                    else:
+                        spool.codes.write(np.full(len(block), NULL_CODE, dtype=np.int32).tobytes())
+                elif present:
+                    spool.extend_encoded(*snapshot.column(name).take(block))
+                else:
+                    spool.extend_encoded(np.zeros(len(block), dtype=np.int64), b"")
+            self.records_count += len(block)
+
+    def close(self):
+        order = self._order + [name for name in self._columns if name not in self._order]
+        layout = []
+        buffers = []
+        position = 0
+
+        def add(spool: _Spool) -> List[int]:
+            nonlocal position
+            ref = [position, spool.nbytes]
+            buffers.append(spool)
+            position += spool.nbytes + (-spool.nbytes % ALIGNMENT)
+            return ref
+
+        for name in order:
+            spool = self._columns[name]
+            if name == AMOUNT_COLUMN:
+                layout.append({"name": name, "type": "float64", "data": add(spool)})
+            elif name == DATE_COLUMN:
+                layout.append({"name": name, "type": "date32", "data": add(spool)})
+            elif isinstance(spool, _DictionarySpool):
+                layout.append({
+                    "name": name,
+                    "type": "dictionary",
+                    "codes": add(spool.codes),
+                    "offsets": add(spool.values.offsets),
+                    "data": add(spool.values.data),
+                    "size": spool.values.count,
+                })
+            else:
+                layout.append({
+                    "name": name,
+                    "type": "string",
+                    "offsets": add(spool.offsets),
+                    "data": add(spool.data),
+                })
+
+        header = json.dumps({
+            "version": 1,
+            "rows": self.records_count,
+            "total_amount": self.total_amount,
+            "metadata": self.metadata,
+            "columns": layout,
+        }).encode("utf-8")
+        header_end = _HEADER_PREFIX.size + len(header)
+        header += b" " * (-header_end % ALIGNMENT)
+
+        tmp_path = f"{self.path}.part"
+        with open(tmp_path, "wb") as out:
+            out.write(_HEADER_PREFIX.pack(MAGIC, len(header)))
+            out.write(header)
+            for spool in buffers:
+                spool.fh.seek(0)
+                while True:
+                    block = spool.fh.read(1024 * 1024)
+                    if not block:
+                        break
+                    out.write(block)
+                out.write(b"\0" * (-spool.nbytes % ALIGNMENT))
+        os.replace(tmp_path, self.path)
+        self._cleanup()
+
+    def abort(self):
+        tmp_path = f"{self.path}.part"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        self._cleanup()
+
+    def _cleanup(self):
+        for spool in self._spools:
+            spool.fh.close()
+        try:
+            os.rmdir(self._tmp_dir)
+        except OSError:
+            pass
+
+
+class StringColumn:
+    def __init__(self, buffer, base: int, offsets_ref: List[int], data_ref: List[int]):
+        count = offsets_ref[1] // 8
+        self.offsets = np.frombuffer(buffer, dtype=np.int64, count=count, offset=base + offsets_ref[0])
+        self._data = memoryview(buffer)[base + data_ref[0]:base + data_ref[0] + data_ref[1]]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return bytes(self._data[start:end]).decode("utf-8")
+
+    def to_list(self) -> List[str]:
+        data, offsets = bytes(self._data), self.offsets.tolist()
+        return [data[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+    def take(self, rows: np.ndarray) -> Tuple[np.ndarray, bytes]:
+        """UTF-8 byte lengths and concatenated bytes of the strings at ``rows``."""
+        starts = self.offsets[rows]
+        lengths = self.offsets[rows + 1] - starts
+        # Position of every selected byte: its string's start plus its index within the string
+        ends = np.cumsum(lengths)
+        positions = np.arange(int(ends[-1]) if len(ends) else 0) + np.repeat(starts - (ends - lengths), lengths)
+        return lengths, np.frombuffer(self._data, dtype=np.uint8)[positions].tobytes()
+
+
+class DictionaryColumn:
+    def __init__(self, buffer, base: int, rows: int, spec: dict):
+        self.codes = np.frombuffer(buffer, dtype=np.int32, count=rows, offset=base + spec["codes"][0])
+        self.values = StringColumn(buffer, base, spec["offsets"], spec["data"])
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        code = self.codes[i]
+        return None if code == NULL_CODE else self.values[code]
+
+    def decode(self, code: int) -> Optional[str]:
+        return None if code == NULL_CODE else self.values[code]
+
+    def to_list(self) -> List[Optional[str]]:
+        # The extra slot decodes NULL_CODE (-1) to None
+        values = np.array(self.values.to_list() + [None], dtype=object)
+        return values[self.codes].tolist()
+
+
+class Snapshot:
+    """
+    Read-only view over a ``.dsnap`` buffer.
+
+    Numeric columns are NumPy arrays backed directly by the buffer; strings
+    are only decoded for the rows that are actually looked at.
+    """
+    def __init__(self, buffer, name: str = ""):
+        magic, header_len = _HEADER_PREFIX.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{name or 'buffer'} is not a donation snapshot")
+        header_end = _HEADER_PREFIX.size + header_len
+        self.name = name
+        self.header = json.loads(bytes(buffer[_HEADER_PREFIX.size:header_end]))
+        self.rows: int = self.header["rows"]
+        self.metadata: dict = self.header.get("metadata", {})
+        self._buffer = buffer
+        self._base = header_end
+        self._specs = {spec["name"]: spec for spec in self.header["columns"]}
+        self._cache: Dict[str, object] = {}
+
+    @classmethod
+    def open(cls, path: str) -> "Snapshot":
+        """Open a snapshot file, memory mapping ``.dsnap`` files."""
+        if path.endswith(LEGACY_EXT):
+            return cls(_legacy_json_buffer(path), os.path.basename(path))
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, os.path.basename(path))
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def columns(self) -> List[str]:
+        return [spec["name"] for spec in self.header["columns"]]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def amount(self) -> np.ndarray:
+        return self.column(AMOUNT_COLUMN)
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self.column(DATE_COLUMN)
+
+    def column(self, name: str):
+        if name in self._cache:
+            return self._cache[name]
+        spec = self._specs[name]
+        if spec["type"] == "float64":
+            column = np.frombuffer(self._buffer, dtype=np.float64, count=self.rows, offset=self._base + spec["data"][0])
+        elif spec["type"] == "date32":
+            column = np.frombuffer(self._buffer, dtype=np.int32, count=self.rows, offset=self._base + spec["data"][0])
+        elif spec["type"] == "dictionary":
+            column = DictionaryColumn(self._buffer, self._base, self.rows, spec)
+        else:
+            column = StringColumn(self._buffer, self._base, spec["offsets"], spec["data"])
+        self._cache[name] = column
+        return column
+
+    def record(self, i: int) -> dict:
+        """Materialize a single row as a dict in the legacy JSON shape."""
+        record = {}
+        for name in self.columns:
+            column = self.column(name)
+            if name == AMOUNT_COLUMN:
+                value = float(column[i])
+                record[name] = None if value != value else value
+            elif name == DATE_COLUMN:
+                record[name] = day_to_iso(column[i]) or None
+            else:
+                record[name] = column[i] if isinstance(column, DictionaryColumn) else (column[i] or None)
+        return record
+
+
+def write_snapshot(records: Iterable[dict], path: str, metadata: Optional[dict] = None, chunk_rows: int = 5000):
+    writer = SnapshotWriter(path, metadata)
+    try:
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_rows:
+                writer.write(chunk)
+                chunk = []
+        writer.write(chunk)
+    except Exception:
+        writer.abort()
+        raise
+    writer.close()
+    return writer
+
+
+def _legacy_json_buffer(path: str) -> bytes:
+    with open(path) as f:
+        records = json.load(f)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = os.path.join(tmp_dir, "legacy" + SNAPSHOT_EXT)
+        write_snapshot(records, tmp_path)
+        with open(tmp_path, "rb") as f:
+            return f.read()
+
+
+def convert_json_snapshot(json_path: str, keep_json: bool = False) -> str:
+    """Convert a legacy ``donations_*.json`` snapshot into a ``.dsnap`` next to it."""
+    dsnap_path = json_path[:-len(LEGACY_EXT)] + SNAPSHOT_EXT
+    with open(json_path) as f:
+        records = json.load(f)
+    write_snapshot(records, dsnap_path, {"converted_from": os.path.basename(json_path)})
+    stat = os.stat(json_path)
+    os.utime(dsnap_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    if not keep_json:
+        os.remove(json_path)
+    return dsnap_path
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Convert legacy JSON donation snapshots to the columnar format.")
+    parser.add_argument("data_dir", nargs="?", default="data")
+    parser.add_argument("--keep-json", action="store_true", help="keep the original .json files")
+    args = parser.parse_args(argv)
+
+    for filename in sorted(os.listdir(args.data_dir)):
+        if filename.startswith(SNAPSHOT_PREFIX) and filename.endswith(LEGACY_EXT):
+            dsnap_path = convert_json_snapshot(os.path.join(args.data_dir, filename), args.keep_json)
+            print(f"{filename} -> {os.path.basename(dsnap_path)}")
+
+    # Imported here: the catalog itself is built on this module
+    from app.catalog import SnapshotCatalog
+    SnapshotCatalog(args.data_dir).rebuild()
+
+
+if __name__ == "__main__":
+    main()
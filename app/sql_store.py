@@ -0,0 +1,238 @@
+"""
+SQLite-backed donation store.
+
+Enabled with ``DONATION_STORE=sqlite``. Every upload is still written as a
+snapshot in ``data/``; its rows are then bulk-inserted into an indexed SQLite
+database and the dashboard aggregates are answered with SQL instead of
+scanning the snapshot.
+"""
+import argparse
+import os
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy import (
+    Column, Date, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table,
+    create_engine, event, func, select,
+)
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from app.aggregates import RECENT_ACTIVITY, TOP_DONORS, display_amount, month_key, trend_months
+from app.catalog import file_lock
+from app.snapshot import DATA_DIR, DATE_NULL, Snapshot, list_snapshot_files
+
+
+SQL_STORE_ENABLED = os.getenv("DONATION_STORE", "snapshot") == "sqlite"
+SQLITE_PATH = os.getenv("DONATIONS_DB", os.path.join(DATA_DIR, "donations.db"))
+INSERT_BATCH_ROWS = 10000
+
+DONATION_COLUMNS = ("Donor_Name", "Email", "Phone", "Amount", "Payment_Method", "Transaction_ID", "Date", "Notes")
+
+metadata = MetaData()
+
+uploads = Table(
+    "uploads", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("filename", String, nullable=False, unique=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("records_count", Integer, nullable=False, default=0),
+)
+
+donations = Table(
+    "donations", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("upload_id", Integer, ForeignKey("uploads.id"), nullable=False),
+    Column("Donor_Name", String),
+    Column("Email", String),
+    Column("Phone", String),
+    Column("Amount", Float),
+    Column("Payment_Method", String),
+    Column("Transaction_ID", String),
+    Column("Date", Date),
+    Column("Notes", String),
+    # Dashboard queries are scoped to one upload, so upload_id leads the
+    # Date and Donor_Name indexes; Amount makes the donor index covering.
+    Index("ix_donations_upload_date", "upload_id", "Date"),
+    Index("ix_donations_upload_donor", "upload_id", "Donor_Name", "Amount"),
+    Index("ix_donations_transaction_id", "Transaction_ID"),
+)
+
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+
+def _create_schema(engine: Engine):
+    # Serialized across processes: ingest workers and the server may all
+    # open a new database at once, and create_all's check-then-create races
+    with file_lock(f"{SQLITE_PATH}.schema.lock"):
+        try:
+            metadata.create_all(engine, checkfirst=True)
+        except OperationalError as e:
+            if "already exists" not in str(e):
+                raise
+
+
+def get_engine() -> Engine:
+    """Return the process-wide engine, creating the schema on first use."""
+    global _engine
+    if _engine is not None:
+        return _engine
+    with _engine_lock:
+        if _engine is not None:
+            return _engine
+        os.makedirs(os.path.dirname(os.path.abspath(SQLITE_PATH)), exist_ok=True)
+        # Ingest workers write from separate processes; wait on the lock rather than fail
+        engine = create_engine(f"sqlite:///{SQLITE_PATH}", connect_args={"timeout": 30})
+
+        @event.listens_for(engine, "connect")
+        def _set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+
+        _create_schema(engine)
+        _engine = engine
+        return _engine
+
+
+def _batch_rows(snapshot: Snapshot, upload_id: int, start: int, stop: int) -> List[dict]:
+    columns = {}
+    for name in DONATION_COLUMNS:
+        if name not in snapshot.columns:
+            columns[name] = [None] * (stop - start)
+        elif name == "Amount":
+            amounts = snapshot.amount[start:stop]
+            columns[name] = np.where(np.isnan(amounts), None, amounts).tolist()
+        elif name == "Date":
+            days = snapshot.dates[start:stop]
+            as_dates = days.astype("datetime64[D]").astype(object)
+            columns[name] = [None if day == DATE_NULL else value for day, value in zip(days.tolist(), as_dates)]
+        else:
+            column = snapshot.column(name)
+            columns[name] = [column[i] or None for i in range(start, stop)]
+
+    return [
+        dict(zip(DONATION_COLUMNS, values), upload_id=upload_id)
+        for values in zip(*(columns[name] for name in DONATION_COLUMNS))
+    ]
+
+
+def ingest_snapshot(file_path: str, created_at: Optional[datetime] = None) -> int:
+    """
+    Bulk-insert a snapshot's rows into the database in one transaction.
+
+    Rows are inserted ``INSERT_BATCH_ROWS`` at a time through executemany.
+    Returns the new upload id.
+    """
+    snapshot = Snapshot.open(file_path)
+    created_at = created_at or datetime.fromtimestamp(os.path.getmtime(file_path))
+    with get_engine().begin() as conn:
+        upload_id = conn.execute(uploads.insert().values(
+            filename=os.path.basename(file_path),
+            created_at=created_at,
+            records_count=len(snapshot),
+        )).inserted_primary_key[0]
+        for start in range(0, len(snapshot), INSERT_BATCH_ROWS):
+            stop = min(start + INSERT_BATCH_ROWS, len(snapshot))
+            conn.execute(donations.insert(), _batch_rows(snapshot, upload_id, start, stop))
+    return upload_id
+
+
+def latest_dashboard(unknown_name: str = "Unknown") -> Optional[dict]:
+    """Answer the dashboard aggregates for the newest upload with indexed queries."""
+    with get_engine().connect() as conn:
+        upload = conn.execute(
+            select(uploads.c.id, uploads.c.filename).order_by(uploads.c.id.desc()).limit(1)
+        ).first()
+        if upload is None:
+            return None
+        in_upload = donations.c.upload_id == upload.id
+
+        total_donations, total_amount, active_donors = conn.execute(
+            select(
+                func.count(),
+                func.coalesce(func.sum(donations.c.Amount), 0.0),
+                func.count(func.distinct(donations.c.Donor_Name)),
+            ).where(in_upload)
+        ).one()
+        if not total_donations:
+            return None
+
+        donor_total = func.sum(func.coalesce(donations.c.Amount, 0.0)).label("total")
+        top_donors = [
+            {"name": name or unknown_name, "total": float(total)}
+            for name, total in conn.execute(
+                select(donations.c.Donor_Name, donor_total)
+                .where(in_upload)
+                .group_by(donations.c.Donor_Name)
+                .order_by(donor_total.desc())
+                .limit(TOP_DONORS)
+            )
+        ]
+
+        recent_rows = conn.execute(
+            select(donations.c.Donor_Name, donations.c.Amount, donations.c.Date)
+            .where(in_upload)
+            .order_by(donations.c.id.desc())
+            .limit(RECENT_ACTIVITY)
+        ).all()
+        recent_activity = []
+        for name, amount, day in reversed(recent_rows):
+            amount = float(amount or 0)
+            recent_activity.append({
+                "type": "donation",
+                "message": f"${display_amount(amount)} from {name or unknown_name}",
+                "date": day.isoformat() if day else "",
+                "amount": amount
+            })
+
+        window = trend_months()
+        first_month, last_month = window[0][0], window[-1][0]
+        month_label = func.strftime("%Y-%m", donations.c.Date).label("month")
+        month_totals = dict(conn.execute(
+            select(month_label, func.sum(donations.c.Amount))
+            .where(in_upload)
+            .where(donations.c.Date >= _month_start(first_month))
+            .where(donations.c.Date < _month_start(last_month + 1))
+            .group_by(month_label)
+        ).all())
+        monthly_trend = [
+            {"month": label, "amount": float(month_totals.get(month_key(month)) or 0)}
+            for month, label in window
+        ]
+
+    return {
+        "total_donations": total_donations,
+        "total_amount": round(float(total_amount), 2),
+        "active_donors": active_donors,
+        "recent_activity": recent_activity,
+        "top_donors": top_donors,
+        "monthly_trend": monthly_trend,
+        "data_source": upload.filename
+    }
+
+
+def _month_start(month_index: int):
+    return datetime(1970 + month_index // 12, month_index % 12 + 1, 1).date()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load existing snapshots into the SQLite donation store.")
+    parser.add_argument("data_dir", nargs="?", default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    with get_engine().connect() as conn:
+        loaded = set(conn.execute(select(uploads.c.filename)).scalars())
+    # Oldest first so upload ids follow upload order
+    for filename in reversed(list_snapshot_files(args.data_dir)):
+        if filename not in loaded:
+            ingest_snapshot(os.path.join(args.data_dir, filename))
+            print(f"loaded {filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,462 @@
+// Check authentication on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const token = localStorage.getItem('authToken');
+
+    if (!token) {
+        // No token, show login prompt
+        document.getElementById('loadingContainer').style.display = 'none';
+        document.getElementById('authContainer').style.display = 'block';
+        return;
+    }
+
+    // Token exists, validate it using the validation endpoint
+    fetch('/auth/validate', {
+        method: 'GET',
+        headers: {
+            'Authorization': `Bearer ${token}`,
+            'Content-Type': 'application/json'
+        }
+    })
+    .then(response => {
+        if (response.ok) {
+            return response.json();
+        } else {
+            throw new Error('Token validation failed');
+        }
+    })
+    .then(data => {
+        // Token is valid, show dashboard
+        document.getElementById('loadingContainer').style.display = 'none';
+        document.getElementById('dashboardContainer').style.display = 'block';
+
+        // Set user info
+        const user = data.user;
+        document.getElementById('userName').textContent = user;
+        document.getElementById('userAvatar').textContent = user[0].toUpperCase();
+
+        // Add interactive features
+        const actionButtons = document.querySelectorAll('.action-btn');
+        actionButtons.forEach(button => {
+            button.addEventListener('click', function() {
+                alert('This feature is coming soon!');
+            });
+        });
+
+        // Add animation to stat cards
+        const statCards = document.querySelectorAll('.stat-card');
+        statCards.forEach((card, index) => {
+            setTimeout(() => {
+                card.style.opacity = '1';
+                card.style.transform = 'translateY(0)';
+            }, index * 100);
+        });
+
+        // Load dashboard data, then keep it current as uploads land
+        subscribeDashboard();
+    })
+    .catch(error => {
+        console.error('Authentication error:', error);
+        // Token is invalid, clear it and show login
+        localStorage.removeItem('authToken');
+        document.getElementById('loadingContainer').style.display = 'none';
+        document.getElementById('authContainer').style.display = 'block';
+    });
+});
+
+// Dashboard Data Functions
+function loadDashboardData() {
+    const token = localStorage.getItem('authToken');
+
+    fetch('/dashboard-data', {
+        method: 'GET',
+        headers: {
+            'Authorization': `Bearer ${token}`,
+            'Content-Type': 'application/json'
+        }
+    })
+    .then(response => response.json())
+    .then(data => renderDashboard(data))
+    .catch(error => {
+        console.error('Error loading dashboard data:', error);
+        showDashboardError();
+    });
+}
+
+let dashboardEvents = null;
+
+function renderDashboard(data) {
+    updateDashboardStats(data);
+    updateRecentActivity(data.recent_activity);
+    updateTopDonors(data.top_donors);
+    updateMonthlyTrend(data.monthly_trend);
+}
+
+function subscribeDashboard() {
+    if (!window.EventSource) {
+        loadDashboardData();
+        return;
+    }
+    const token = localStorage.getItem('authToken');
+    // EventSource cannot send an Authorization header
+    dashboardEvents = new EventSource(`/dashboard-events?token=${encodeURIComponent(token)}`);
+    dashboardEvents.addEventListener('aggregates', event => {
+        renderDashboard(JSON.parse(event.data).data);
+    });
+    dashboardEvents.onerror = () => {
+        // The browser reconnects on its own unless the stream was refused
+        if (dashboardEvents.readyState === EventSource.CLOSED) {
+            showDashboardError();
+        }
+    };
+}
+
+function updateDashboardStats(data) {
+    document.getElementById('totalDonations').textContent = data.total_donations.toLocaleString();
+    document.getElementById('totalAmount').textContent = `$${data.total_amount.toLocaleString()}`;
+    document.getElementById('activeDonors').textContent = data.active_donors.toLocaleString();
+}
+
+function updateRecentActivity(activities) {
+    const container = document.getElementById('recentActivity');
+    if (activities.length === 0) {
+        container.innerHTML = '<p>No recent activity found.</p>';
+        return;
+    }
+
+    let html = '';
+    activities.forEach(activity => {
+        html += `<p>• ${activity.message} (${activity.date})</p>`;
+    });
+    container.innerHTML = html;
+}
+
+function updateTopDonors(donors) {
+    const container = document.getElementById('topDonors');
+    if (donors.length === 0) {
+        container.innerHTML = '<p>No donor data available.</p>';
+        return;
+    }
+
+    let html = '';
+    donors.forEach((donor, index) => {
+        const rank = index + 1;
+        const emoji = rank === 1 ? '🥇' : rank === 2 ? '🥈' : rank === 3 ? '🥉' : '🏅';
+        html += `<p>${emoji} ${donor.name}: $${donor.total.toLocaleString()}</p>`;
+    });
+    container.innerHTML = html;
+}
+
+function updateMonthlyTrend(trend) {
+    const container = document.getElementById('monthlyTrend');
+    if (trend.length === 0) {
+        container.innerHTML = '<p>No trend data available.</p>';
+        return;
+    }
+
+    // Find the maximum amount for scaling
+    const maxAmount = Math.max(...trend.map(month => month.amount));
+
+    let html = '<div class="monthly-trend">';
+    trend.forEach(month => {
+        const height = maxAmount > 0 ? (month.amount / maxAmount) * 80 : 0;
+        html += `
+            <div style="display: flex; flex-direction: column; align-items: center;">
+                <div class="trend-bar" style="height: ${height}px; width: 30px;" title="${month.month}: $${month.amount.toLocaleString()}"></div>
+                <div class="trend-label">${month.month}</div>
+            </div>
+        `;
+    });
+    html += '</div>';
+    container.innerHTML = html;
+}
+
+function showDashboardError() {
+    document.getElementById('totalDonations').textContent = 'Error';
+    document.getElementById('totalAmount').textContent = 'Error';
+    document.getElementById('activeDonors').textContent = 'Error';
+    document.getElementById('recentActivity').innerHTML = '<p>Error loading data. Please try refreshing.</p>';
+    document.getElementById('topDonors').innerHTML = '<p>Error loading data. Please try refreshing.</p>';
+    document.getElementById('monthlyTrend').innerHTML = '<p>Error loading data. Please try refreshing.</p>';
+}
+
+function refreshDashboard() {
+    loadDashboardData();
+    // Show a brief loading state
+    document.getElementById('totalDonations').textContent = '...';
+    document.getElementById('totalAmount').textContent = '...';
+    document.getElementById('activeDonors').textContent = '...';
+    document.getElementById('recentActivity').innerHTML = '<p>Refreshing...</p>';
+    document.getElementById('topDonors').innerHTML = '<p>Refreshing...</p>';
+    document.getElementById('monthlyTrend').innerHTML = '<p>Refreshing...</p>';
+}
+
+function logout() {
+    // Clear any stored tokens
+    localStorage.removeItem('authToken');
+    sessionStorage.removeItem('authToken');
+
+    // Redirect to login page
+    window.location.href = '/';
+}
+
+// Modal Functions
+function openUploadModal() {
+    document.getElementById('uploadModal').style.display = 'block';
+    setupFileUpload();
+}
+
+function closeUploadModal() {
+    document.getElementById('uploadModal').style.display = 'none';
+    resetUploadForm();
+}
+
+function openUploadsModal() {
+    document.getElementById('uploadsModal').style.display = 'block';
+    loadUploads();
+}
+
+function closeUploadsModal() {
+    document.getElementById('uploadsModal').style.display = 'none';
+}
+
+function viewUploads() {
+    openUploadsModal();
+}
+
+// File Upload Functions
+function setupFileUpload() {
+    const uploadArea = document.getElementById('uploadArea');
+    const fileInput = document.getElementById('fileInput');
+
+    // Drag and drop functionality
+    uploadArea.addEventListener('dragover', (e) => {
+        e.preventDefault();
+        uploadArea.style.borderColor = '#667eea';
+        uploadArea.style.backgroundColor = '#f0f4ff';
+    });
+
+    uploadArea.addEventListener('dragleave', (e) => {
+        e.preventDefault();
+        uploadArea.style.borderColor = '#ccc';
+        uploadArea.style.backgroundColor = '#f9f9f9';
+    });
+
+    uploadArea.addEventListener('drop', (e) => {
+        e.preventDefault();
+        uploadArea.style.borderColor = '#ccc';
+        uploadArea.style.backgroundColor = '#f9f9f9';
+
+        const files = e.dataTransfer.files;
+        if (files.length > 0) {
+            handleFileUpload(files[0]);
+        }
+    });
+
+    // File input change
+    fileInput.addEventListener('change', (e) => {
+        if (e.target.files.length > 0) {
+            handleFileUpload(e.target.files[0]);
+        }
+    });
+}
+
+function handleFileUpload(file) {
+    // Validate file type
+    const fileName = file.name.toLowerCase();
+    if (!['.xlsx', '.xls', '.csv', '.tsv', '.ndjson', '.jsonl'].some(ext => fileName.endsWith(ext))) {
+        showUploadResult('Please select an Excel (.xlsx, .xls), CSV, TSV or NDJSON file', 'error');
+        return;
+    }
+
+    // Show progress
+    document.getElementById('uploadArea').style.display = 'none';
+    document.getElementById('uploadProgress').style.display = 'block';
+    document.getElementById('uploadResult').style.display = 'none';
+
+    // Simulate progress
+    let progress = 0;
+    const progressInterval = setInterval(() => {
+        progress += 10;
+        document.getElementById('progressFill').style.width = progress + '%';
+        if (progress >= 100) {
+            clearInterval(progressInterval);
+            uploadFile(file);
+        }
+    }, 200);
+}
+
+function uploadFile(file) {
+    const token = localStorage.getItem('authToken');
+    const formData = new FormData();
+    formData.append('file', file);
+
+    fetch('/upload-excel?async=true', {
+        method: 'POST',
+        headers: {
+            'Authorization': `Bearer ${token}`
+        },
+        body: formData
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.job_id) {
+            showUploadResult(`⏳ ${data.message}, processing...`, 'success');
+            pollUploadJob(data.status_url, token);
+        } else if (data.already_uploaded) {
+            document.getElementById('uploadProgress').style.display = 'none';
+            showUploadResult(`✅ ${data.message}<br>📁 File: ${data.filename}<br>📊 Records: ${data.records_count}`, 'success');
+        } else {
+            document.getElementById('uploadProgress').style.display = 'none';
+            showUploadResult('❌ Upload failed: ' + (data.detail || 'Unknown error'), 'error');
+        }
+    })
+    .catch(error => {
+        console.error('Upload error:', error);
+        document.getElementById('uploadProgress').style.display = 'none';
+        showUploadResult('❌ Upload failed: Network error', 'error');
+    });
+}
+
+function pollUploadJob(statusUrl, token) {
+    fetch(statusUrl, {
+        method: 'GET',
+        headers: {
+            'Authorization': `Bearer ${token}`
+        }
+    })
+    .then(response => response.json())
+    .then(job => {
+        if (job.state === 'queued' || job.state === 'running') {
+            showUploadResult(`⏳ Processing ${job.filename}...<br>📊 Rows: ${job.rows_processed} (${job.rows_per_second} rows/s)`, 'success');
+            setTimeout(() => pollUploadJob(statusUrl, token), 1000);
+            return;
+        }
+
+        document.getElementById('uploadProgress').style.display = 'none';
+        if (job.state === 'succeeded') {
+            const rejected = job.result.rejected ? `<br>⚠️ Rejected rows: ${job.result.rejected} (first: row ${job.result.errors[0].row}, ${job.result.errors[0].error})` : '';
+            const warned = job.result.warned ? `<br>⚠️ Rows stored with warnings: ${job.result.warned} (first: row ${job.result.warnings[0].row}, ${job.result.warnings[0].error})` : '';
+            showUploadResult(`✅ File uploaded successfully<br>📁 File: ${job.result.filename}<br>📊 Records: ${job.result.records_count}${rejected}${warned}`, 'success');
+            // Open dashboards are updated by the aggregates event
+            if (!dashboardEvents) {
+                loadDashboardData();
+            }
+        } else {
+            const rejected = job.result && job.result.rejected ? `<br>⚠️ Rejected rows: ${job.result.rejected} (first: row ${job.result.errors[0].row}, ${job.result.errors[0].error})` : '';
+            showUploadResult('❌ Upload failed: ' + (job.errors.join('; ') || job.detail || 'Unknown error') + rejected, 'error');
+        }
+    })
+    .catch(error => {
+        console.error('Upload status error:', error);
+        document.getElementById('uploadProgress').style.display = 'none';
+        showUploadResult('❌ Upload failed: Network error', 'error');
+    });
+}
+
+function showUploadResult(message, type) {
+    const resultDiv = document.getElementById('uploadResult');
+    resultDiv.innerHTML = message;
+    resultDiv.className = type;
+    resultDiv.style.display = 'block';
+}
+
+function resetUploadForm() {
+    document.getElementById('uploadArea').style.display = 'block';
+    document.getElementById('uploadProgress').style.display = 'none';
+    document.getElementById('uploadResult').style.display = 'none';
+    document.getElementById('fileInput').value = '';
+    document.getElementById('progressFill').style.width = '0%';
+}
+
+// Load Uploads Function
+function loadUploads() {
+    const uploadsList = document.getElementById('uploadsList');
+    uploadsList.innerHTML = '<div class="loading-spinner"></div><p>Loading files...</p>';
+
+    const token = localStorage.getItem('authToken');
+
+    fetch('/list-uploads', {
+        method: 'GET',
+        headers: {
+            'Authorization': `Bearer ${token}`,
+            'Content-Type': 'application/json'
+        }
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (data.files && data.files.length > 0) {
+            displayUploads(data.files);
+        } else {
+            uploadsList.innerHTML = '<p>No files uploaded yet.</p>';
+        }
+    })
+    .catch(error => {
+        console.error('Error loading uploads:', error);
+        uploadsList.innerHTML = '<p>Error loading files. Please try again.</p>';
+    });
+}
+
+function displayUploads(files) {
+    const uploadsList = document.getElementById('uploadsList');
+    let html = '<div style="max-height: 400px; overflow-y: auto;">';
+
+    files.forEach(file => {
+        const fileSize = formatFileSize(file.size);
+        const createdDate = new Date(file.created).toLocaleString();
+
+        html += `
+            <div style="
+                background: white;
+                padding: 15px;
+                margin-bottom: 10px;
+                border-radius: 8px;
+                border-left: 4px solid #667eea;
+                box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            ">
+                <div style="display: flex; justify-content: space-between; align-items: center;">
+                    <div>
+                        <h4 style="margin: 0 0 5px 0; color: #333;">${file.filename}</h4>
+                        <p style="margin: 0; color: #666; font-size: 0.9rem;">
+                            📅 Created: ${createdDate}<br>
+                            📏 Size: ${fileSize}
+                        </p>
+                    </div>
+                    <div style="text-align: right;">
+                        <button onclick="viewFile('${file.filename}')" style="
+                            background: #667eea;
+                            color: white;
+                            border: none;
+                            padding: 5px 10px;
+                            border-radius: 4px;
+                            cursor: pointer;
+                            font-size: 0.8rem;
+                        ">View</button>
+                    </div>
+                </div>
+            </div>
+        `;
+    });
+
+    html += '</div>';
+    uploadsList.innerHTML = html;
+}
+
+function formatFileSize(bytes) {
+    if (bytes === 0) return '0 Bytes';
+    const k = 1024;
+    const sizes = ['Bytes', 'KB', 'MB', 'GB'];
+    const i = Math.floor(Math.log(bytes) / Math.log(k));
+    return parseFloat((bytes / Math.pow(k, i)).toFixed(2)) + ' ' + sizes[i];
+}
+
+function viewFile(filename) {
+    alert(`Viewing file: ${filename}
+
+This would open the file viewer in a real application.`);
+}
+
+function downloadTemplate() {
+    const token = localStorage.getItem('authToken');
+    const url = `/download-template?token=${token}`;
+    window.location.href = url;
+}
@@ -0,0 +1,90 @@
+// Check for existing authentication on page load
+document.addEventListener('DOMContentLoaded', function() {
+    const token = localStorage.getItem('authToken');
+    if (token) {
+        // Show loading state
+        document.getElementById('loadingContainer').style.display = 'block';
+        document.getElementById('loginForm').style.display = 'none';
+
+        // Validate the existing token
+        fetch('/auth/validate', {
+            method: 'GET',
+            headers: {
+                'Authorization': `Bearer ${token}`,
+                'Content-Type': 'application/json'
+            }
+        })
+        .then(response => {
+            if (response.ok) {
+                // Token is valid, redirect to admin portal
+                window.location.href = '/admin';
+            } else {
+                // Token is invalid, clear it and show login form
+                localStorage.removeItem('authToken');
+                document.getElementById('loadingContainer').style.display = 'none';
+                document.getElementById('loginForm').style.display = 'block';
+            }
+        })
+        .catch(error => {
+            console.error('Token validation error:', error);
+            // Error occurred, clear token and show login form
+            localStorage.removeItem('authToken');
+            document.getElementById('loadingContainer').style.display = 'none';
+            document.getElementById('loginForm').style.display = 'block';
+        });
+    }
+});
+
+document.getElementById('loginForm').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const username = document.getElementById('username').value;
+    const password = document.getElementById('password').value;
+    const loginBtn = document.getElementById('loginBtn');
+    const errorMessage = document.getElementById('errorMessage');
+    const successMessage = document.getElementById('successMessage');
+
+    // Clear previous messages
+    errorMessage.style.display = 'none';
+    successMessage.style.display = 'none';
+
+    // Disable button and show loading state
+    loginBtn.disabled = true;
+    loginBtn.textContent = 'Logging in...';
+
+    try {
+        // Step 1: Get bearer token
+        const loginResponse = await fetch('/auth/login', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                username: username,
+                password: password
+            })
+        });
+
+        if (!loginResponse.ok) {
+            throw new Error('Invalid credentials');
+        }
+
+        const tokenData = await loginResponse.json();
+        const bearerToken = tokenData.access_token;
+
+        // Store the token for future use
+        localStorage.setItem('authToken', bearerToken);
+
+        // Step 2: Redirect to admin page
+        window.location.href = '/admin';
+
+    } catch (error) {
+        console.error('Login error:', error);
+        errorMessage.textContent = error.message || 'Login failed. Please try again.';
+        errorMessage.style.display = 'block';
+    } finally {
+        // Re-enable button
+        loginBtn.disabled = false;
+        loginBtn.textContent = 'Login';
+    }
+});
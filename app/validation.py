@@ -0,0 +1,120 @@
+"""
+Validation and normalization of uploaded rows.
+
+Every chunk of parsed rows, a DataFrame, passes through ``RowValidator``
+before it is written, one vectorized pass per column:
+
+- ``Amount`` is coerced to a float (currency symbols and thousands
+  separators are stripped); rows without a valid amount are rejected.
+- ``Date`` is parsed to a calendar date. ISO dates are read first, then
+  US/European style and written-out dates (see ``to_day_ordinals``); rows
+  with a date that cannot be parsed at all are rejected, empty dates are
+  kept.
+- ``Donor_Name`` is trimmed with inner whitespace collapsed, ``Email`` is
+  trimmed and lower-cased. A malformed email does not cost the donation:
+  the row is kept with an empty email and a warning.
+
+Rejected rows are left out of the snapshot and listed in the error report
+returned with the upload result, next to the warnings.
+"""
+from typing import List, Union
+
+import numpy as np
+import pandas as pd
+
+from app.snapshot import DATE_NULL, as_frame, to_day_ordinals
+
+
+MAX_REPORTED_ERRORS = 100
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+
+def _text(values: pd.Series) -> pd.Series:
+    """Trimmed strings with blanks as missing values."""
+    text = values.astype(object)
+    text = text.where(text.isna(), text.astype(str)).str.strip()
+    return text.mask(text == "")
+
+
+class RowValidator:
+    def __init__(self):
+        self.rows_seen = 0
+        self.rejected = 0
+        self.errors: List[dict] = []
+        self.warned = 0
+        self.warnings: List[dict] = []
+
+    def _describe(self, reported: List[dict], values: pd.Series, rows: np.ndarray, column: str, reason: str):
+        for i in rows.tolist():
+            if len(reported) >= MAX_REPORTED_ERRORS:
+                break
+            value = values.iat[i]
+            reported.append({
+                "row": self.rows_seen + i + 1,
+                "column": column,
+                "error": reason,
+                "value": None if pd.isna(value) else str(value),
+            })
+
+    def _reject(self, values: pd.Series, bad: np.ndarray, column: str, reason: str, rejected: np.ndarray):
+        # A row is reported once, for the first column that fails
+        self._describe(self.errors, values, np.flatnonzero(bad & ~rejected), column, reason)
+        rejected |= bad
+
+    def _warn(self, values: pd.Series, bad: np.ndarray, column: str, reason: str, rejected: np.ndarray):
+        rows = np.flatnonzero(bad & ~rejected)
+        self._describe(self.warnings, values, rows, column, reason)
+        self.warned += len(rows)
+
+    def __call__(self, records: Union[pd.DataFrame, List[dict]]) -> pd.DataFrame:
+        """
+        Return the valid rows of a chunk, normalized, as a DataFrame.
+
+        ``Amount`` becomes a float column and ``Date`` a datetime column,
+        so the snapshot writer stores both without parsing them again.
+        """
+        frame = as_frame(records)
+        if not len(frame):
+            return frame
+        frame = frame.copy(deep=False)
+        rejected = np.zeros(len(frame), dtype=bool)
+
+        if "Amount" in frame.columns:
+            raw = frame["Amount"]
+            if pd.api.types.is_numeric_dtype(raw.dtype):
+                amounts = raw.astype(np.float64)
+            else:
+                amounts = pd.to_numeric(_text(raw).str.replace(r"[$,\s]", "", regex=True), errors="coerce")
+            self._reject(raw, amounts.isna().to_numpy(), "Amount", "Amount is missing or not a number", rejected)
+            frame["Amount"] = amounts.to_numpy(dtype=np.float64)
+
+        if "Date" in frame.columns:
+            raw = frame["Date"]
+            given = _text(raw).notna().to_numpy()
+            days = to_day_ordinals(raw.where(given))
+            missing = days == DATE_NULL
+            self._reject(raw, given & missing, "Date", "Date is not a valid date", rejected)
+            dates = days.astype("datetime64[D]")
+            dates[missing] = np.datetime64("NaT")
+            frame["Date"] = dates
+
+        if "Donor_Name" in frame.columns:
+            names = _text(frame["Donor_Name"]).str.replace(r"\s+", " ", regex=True)
+            frame["Donor_Name"] = names.astype(object).where(names.notna(), None)
+
+        if "Email" in frame.columns:
+            raw = frame["Email"]
+            emails = _text(raw).str.lower()
+            malformed = emails.notna() & ~emails.str.match(EMAIL_PATTERN, na=False)
+            self._warn(raw, malformed.to_numpy(), "Email", "Email is not a valid address and was left empty", rejected)
+            emails = emails.mask(malformed)
+            frame["Email"] = emails.astype(object).where(emails.notna(), None)
+
+        self.errors.sort(key=lambda error: error["row"])
+        self.warnings.sort(key=lambda warning: warning["row"])
+        self.rows_seen += len(frame)
+        self.rejected += int(rejected.sum())
+        return frame[~rejected].reset_index(drop=True)
+
+    def report(self) -> dict:
+        return {"rejected": self.rejected, "errors": self.errors, "warned": self.warned, "warnings": self.warnings}
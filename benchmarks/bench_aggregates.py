@@ -0,0 +1,114 @@
+"""
+Benchmark the dashboard aggregation engine.
+
+Builds synthetic snapshots of 10k, 100k and 1M rows and times:
+
+* ``legacy``  - the original per-row loop over a list of dicts (six
+  ``strptime`` passes for the monthly trend), skipped above ``--legacy-max``
+* ``engine``  - ``compute_aggregates`` on a freshly memory-mapped snapshot
+* ``payload`` - shaping a stored sidecar into the endpoint response
+
+Run from the repository root::
+
+    python -m benchmarks.bench_aggregates
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.aggregates import compute_aggregates, dashboard_payload
+from app.snapshot import Snapshot, SnapshotWriter
+
+
+def synthetic_records(rows: int, start: int, stop: int, rng: np.random.Generator):
+    donors = max(10, rows // 20)
+    base = datetime(2023, 1, 1)
+    donor_ids = rng.integers(0, donors, stop - start)
+    amounts = np.round(rng.gamma(2.0, 60.0, stop - start), 2)
+    offsets = rng.integers(0, 3 * 365, stop - start)
+    for i, donor, amount, offset in zip(range(start, stop), donor_ids, amounts, offsets):
+        yield {
+            "Donor_Name": f"Donor {donor}",
+            "Email": f"donor{donor}@example.org",
+            "Phone": "555-0100",
+            "Amount": float(amount),
+            "Payment_Method": "Zelle" if i % 3 else "Card",
+            "Transaction_ID": f"T{i:09d}",
+            "Date": (base + timedelta(days=int(offset))).strftime("%Y-%m-%d"),
+            "Notes": "",
+        }
+
+
+def build_snapshot(path: str, rows: int, chunk_rows: int = 50000):
+    rng = np.random.default_rng(rows)
+    writer = SnapshotWriter(path)
+    for start in range(0, rows, chunk_rows):
+        stop = min(rows, start + chunk_rows)
+        writer.write(list(synthetic_records(rows, start, stop, rng)))
+    writer.close()
+
+
+def legacy_aggregates(donations_data):
+    """The per-request loop the endpoints used before the engine existed."""
+    total_amount = sum(float(d.get('Amount') or 0) for d in donations_data)
+    active_donors = len(set(d.get('Donor_Name', '') for d in donations_data if d.get('Donor_Name')))
+    donor_totals = {}
+    for d in donations_data:
+        name = d.get('Donor_Name', 'Unknown')
+        donor_totals[name] = donor_totals.get(name, 0) + float(d.get('Amount') or 0)
+    top_donors = sorted(donor_totals.items(), key=lambda x: x[1], reverse=True)[:5]
+    monthly_trend = []
+    for i in range(6):
+        month_date = datetime.now().replace(day=1) - timedelta(days=30 * i)
+        month_total = 0
+        for d in donations_data:
+            try:
+                donation_date = datetime.strptime(d.get('Date', ''), '%Y-%m-%d')
+                if donation_date.month == month_date.month and donation_date.year == month_date.year:
+                    month_total += float(d.get('Amount') or 0)
+            except Exception:
+                continue
+        monthly_trend.append(month_total)
+    return total_amount, active_donors, top_donors, monthly_trend
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-max", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'legacy ms':>12} {'engine ms':>12} {'payload ms':>12}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for rows in args.sizes:
+            path = os.path.join(tmp_dir, f"bench_{rows}.dsnap")
+            build_snapshot(path, rows)
+
+            legacy = "-"
+            if rows <= args.legacy_max:
+                snapshot = Snapshot.open(path)
+                records = [snapshot.record(i) for i in range(rows)]
+                legacy = f"{best_of(lambda: legacy_aggregates(records), 1) * 1000:.1f}"
+
+            engine = best_of(lambda: compute_aggregates(Snapshot.open(path)), args.repeat)
+            aggregates = compute_aggregates(Snapshot.open(path))
+            payload = best_of(lambda: dashboard_payload(aggregates), args.repeat)
+            print(f"{rows:>10,} {legacy:>12} {engine * 1000:>12.1f} {payload * 1000:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
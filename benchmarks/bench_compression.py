@@ -0,0 +1,81 @@
+"""
+Benchmark response compression.
+
+Builds the payloads the service actually sends for synthetic uploads of 10k
+and 100k rows - the ``/dashboard-data`` JSON, the ``/public-dashboard`` HTML
+and a ``/list-uploads`` listing - and for each gzip level reports:
+
+* ``ratio``     - compressed size as a share of the original
+* ``saved KB``  - bytes saved per response
+* ``ms``        - CPU time to compress one response
+* ``cached ms`` - cost of a compressed-body cache hit (digest + lookup)
+
+Run from the repository root::
+
+    python -m benchmarks.bench_compression
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from app.aggregates import compute_aggregates, dashboard_payload
+from app.compression import CompressedBodyCache
+from app.public_page import render_dashboard
+from app.snapshot import Snapshot
+from benchmarks.bench_aggregates import best_of, build_snapshot
+
+
+def payloads(rows: int, tmp_dir: str):
+    path = os.path.join(tmp_dir, f"bench_{rows}.dsnap")
+    build_snapshot(path, rows)
+    summary = dashboard_payload(compute_aggregates(Snapshot.open(path)))
+    summary["data_source"] = os.path.basename(path)
+    yield f"dashboard-data {rows:,}", json.dumps(summary).encode("utf-8")
+    yield f"public-dashboard {rows:,}", render_dashboard(summary, datetime.now()).encode("utf-8")
+
+
+def upload_listing(uploads: int) -> bytes:
+    files = [
+        {
+            "filename": f"donations_20240101_{i:06d}.dsnap",
+            "original_filename": f"donations_{i}.xlsx",
+            "records_count": 1000 + i,
+            "size": 48_000 + i,
+            "created": "2024-01-01T00:00:00",
+            "modified": "2024-01-01T00:00:00",
+        }
+        for i in range(uploads)
+    ]
+    return json.dumps({"files": files}).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 3, 6, 9])
+    parser.add_argument("--uploads", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bodies = [body for rows in args.sizes for body in payloads(rows, tmp_dir)]
+    bodies.append((f"list-uploads {args.uploads}", upload_listing(args.uploads)))
+
+    print(f"{'payload':<24} {'KB':>8} {'level':>6} {'ratio':>7} {'saved KB':>9} {'ms':>8} {'cached ms':>10}")
+    for name, body in bodies:
+        for level in args.levels:
+            cache = CompressedBodyCache(level=level)
+            compressed = cache.compress(body)
+            uncached = best_of(lambda: cache.compress(body, cacheable=False), args.repeat)
+            cached = best_of(lambda: cache.compress(body), args.repeat)
+            print(
+                f"{name:<24} {len(body) / 1024:>8.1f} {level:>6} {len(compressed) / len(body):>7.1%} "
+                f"{(len(body) - len(compressed)) / 1024:>9.1f} {uncached * 1000:>8.3f} {cached * 1000:>10.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark public dashboard latency under concurrent login load.
+
+Starts the service with uvicorn on a local port, with the admin password
+stored as a bcrypt hash, and for each number of concurrent login clients
+measures ``/public-dashboard`` latency from a single sequential client:
+
+* ``inline`` - bcrypt runs on the event loop inside the login handler, as
+  the login endpoint did before the password check pool existed
+* ``pooled`` - the service's ``PasswordChecker``: bcrypt on a bounded
+  thread pool, logins over the admission limit answered with 429
+
+Run from the repository root::
+
+    python -m benchmarks.bench_login
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import bcrypt
+import httpx
+import numpy as np
+import uvicorn
+
+import app.main
+from app.security import CredentialStore, PasswordChecker
+
+USERNAME = "bench"
+PASSWORD = "bench-password"
+
+
+class InlineChecker(PasswordChecker):
+    async def verify_password(self, username: str, password: str) -> bool:
+        return self.store.verify_password(username, password)
+
+
+async def measure(base: str, logins: int, duration: float):
+    latencies = []
+    statuses = {}
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=base, timeout=60) as client:
+        async def login_client():
+            while time.perf_counter() < deadline:
+                r = await client.post("/auth/login", json={"username": USERNAME, "password": PASSWORD})
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+                if r.status_code == 429:
+                    await asyncio.sleep(0.05)
+
+        async def dashboard_client():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                r = await client.get("/public-dashboard", headers={"Accept-Encoding": "gzip"})
+                r.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(dashboard_client(), *(login_client() for _ in range(logins)))
+    return np.array(latencies) * 1000, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, nargs="+", default=[0, 4, 16, 64])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument("--port", type=int, default=8799)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "login.json"
+        password_hash = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(args.rounds)).decode()
+        path.write_text(json.dumps({"username": USERNAME, "password_hash": password_hash}))
+        store = CredentialStore(path)
+
+    start = time.perf_counter()
+    store.verify_password(USERNAME, PASSWORD)
+    print(f"bcrypt cost {args.rounds}: {(time.perf_counter() - start) * 1000:.0f} ms per check, {os.cpu_count()} CPUs\n")
+
+    server = uvicorn.Server(uvicorn.Config(app.main.app, port=args.port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    base = f"http://127.0.0.1:{args.port}"
+
+    print(f"{'checker':<8} {'logins':>7} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'200':>6} {'429':>6}")
+    try:
+        for name, checker in (("inline", InlineChecker(store)), ("pooled", PasswordChecker(store))):
+            app.main.password_checker = checker
+            for logins in args.logins:
+                latencies, statuses = asyncio.run(measure(base, logins, args.duration))
+                print(
+                    f"{name:<8} {logins:>7} {np.percentile(latencies, 50):>8.1f} {np.percentile(latencies, 95):>8.1f} "
+                    f"{latencies.max():>8.1f} {statuses.get(200, 0):>6} {statuses.get(429, 0):>6}"
+                )
+            checker.shutdown()
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
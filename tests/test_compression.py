@@ -0,0 +1,54 @@
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.compression import CompressedBodyCache, CompressionMiddleware, accepts_gzip
+
+
+def test_accepts_gzip_honours_quality_values():
+    assert accepts_gzip("gzip")
+    assert accepts_gzip("deflate, GZIP;q=0.5, br")
+    assert accepts_gzip("x-gzip")
+    assert accepts_gzip("*")
+    assert not accepts_gzip("")
+    assert not accepts_gzip("br, deflate")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("gzip;q=0.0, *;q=1")
+    assert not accepts_gzip("*;q=0")
+    assert not accepts_gzip("gzip;q=oops")
+
+
+def test_unchanged_bodies_are_compressed_once():
+    cache = CompressedBodyCache(max_bytes=1024 * 1024)
+    body = b"donation " * 500
+    first = cache.compress(body)
+    assert cache.compress(body) is first
+    assert gzip.decompress(first) == body
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.compress(body, cacheable=False)
+    assert cache.stats()["entries"] == 1
+
+
+def test_middleware_compresses_large_html_only_for_gzip_clients():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100, cache=CompressedBodyCache())
+
+    @app.get("/page")
+    def page():
+        return HTMLResponse("<p>donation</p>" * 100)
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    client = TestClient(app)
+    compressed = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["vary"]
+    assert compressed.text == "<p>donation</p>" * 100
+
+    plain = client.get("/page", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in plain.headers
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
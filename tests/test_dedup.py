@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from app.dedup import CONFLICT, DUPLICATE, ENTRY_DTYPE, INSERTED, TransactionIndex, index_path, transaction_index
+from app.ingest import ingest_chunks
+from app.snapshot import Snapshot, write_snapshot
+
+
+def donation(tid, name="Jane", amount=100.0, day="2024-01-15", method="Zelle"):
+    return {"Transaction_ID": tid, "Donor_Name": name, "Amount": amount, "Date": day, "Payment_Method": method}
+
+
+def test_known_ids_are_duplicates_or_conflicts():
+    index = TransactionIndex()
+    assert index.check_records([donation("T1"), donation("T2")]).tolist() == [INSERTED, INSERTED]
+    index.merge_pending()
+
+    status = index.check_records([
+        donation("T1"),
+        donation(" T1 "),
+        donation("T2", amount=101),
+        donation("T3"),
+    ])
+    assert status.tolist() == [DUPLICATE, DUPLICATE, CONFLICT, INSERTED]
+
+
+def test_repeats_within_an_upload_are_matched_against_the_first_row():
+    index = TransactionIndex()
+    status = index.check_records([
+        donation("T1"),
+        donation("T1"),
+        donation("T1", name="Bob"),
+        donation("T2", day=None),
+    ])
+    assert status.tolist() == [INSERTED, DUPLICATE, CONFLICT, INSERTED]
+    # Later chunks of the same upload see the ids of earlier ones
+    assert index.check_records([donation("T2", day=None), donation("T2")]).tolist() == [DUPLICATE, CONFLICT]
+
+
+def test_rows_without_transaction_id_are_always_inserted():
+    index = TransactionIndex()
+    status = index.check_records([donation(None), donation(""), donation("  "), donation(None)])
+    assert status.tolist() == [INSERTED] * 4
+
+
+def test_check_snapshot_agrees_with_check_records(tmp_path):
+    records = [donation("T1"), donation("T1"), donation("T1", amount=None), donation(None), donation("T2", method=None)]
+    path = tmp_path / "donations_1.dsnap"
+    write_snapshot(records, str(path))
+
+    assert TransactionIndex().check_snapshot(Snapshot.open(str(path))).tolist() == \
+        TransactionIndex().check_records(records).tolist()
+
+
+def test_dataframe_chunks_match_lists_of_records():
+    records = [donation("T1"), donation("T1", amount=5), donation(None), donation("T2", day=None)]
+    assert TransactionIndex().check_records(pd.DataFrame(records)).tolist() == \
+        TransactionIndex().check_records(records).tolist()
+
+
+def test_index_is_saved_and_reloaded(tmp_path):
+    data_dir = str(tmp_path)
+    with transaction_index(data_dir) as index:
+        index.check_records([donation("T1"), donation("T2")])
+        index.save(data_dir)
+
+    with transaction_index(data_dir) as index:
+        assert index.check_records([donation("T2"), donation("T1", amount=5)]).tolist() == [DUPLICATE, CONFLICT]
+
+
+def test_index_with_other_hashing_is_rebuilt(tmp_path):
+    stale = np.zeros(1, dtype=ENTRY_DTYPE)
+    np.savez(index_path(str(tmp_path)), entries=stale, snapshots=np.array(["donations_0.dsnap"]))
+
+    index = TransactionIndex.load(str(tmp_path))
+    assert index.snapshots == []
+    assert index.check_records([donation("T1")]).tolist() == [INSERTED]
+
+
+def test_append_ingest_reports_and_skips_known_rows(tmp_path):
+    data_dir = str(tmp_path)
+    first = ingest_chunks(iter([[donation("T1"), donation("T2")]]), "first.xlsx", data_dir, append=True)
+    assert (first["inserted"], first["duplicates"], first["conflicts"]) == (2, 0, 0)
+
+    second = ingest_chunks(
+        iter([[donation("T1"), donation("T2", amount=5)], [donation("T3"), donation("T3")]]),
+        "second.xlsx",
+        data_dir,
+        append=True,
+    )
+    assert (second["inserted"], second["duplicates"], second["conflicts"]) == (1, 2, 1)
+    snapshot = Snapshot.open(second["file_path"])
+    assert [snapshot.record(i)["Transaction_ID"] for i in range(len(snapshot))] == ["T3"]
+
+    again = ingest_chunks(iter([[donation("T1")]]), "third.xlsx", data_dir, append=True)
+    assert again["filename"] is None
+    assert again["duplicates"] == 1
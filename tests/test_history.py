@@ -0,0 +1,77 @@
+import json
+import os
+
+from app.aggregates import PartialAggregate
+from app.catalog import SnapshotCatalog, snapshot_entry
+from app.history import add_to_history, history_aggregates_path, history_state_path, sync_history
+from app.snapshot import Snapshot, write_snapshot
+
+
+def upload(data_dir, name, records):
+    path = os.path.join(data_dir, name)
+    write_snapshot(records, path)
+    SnapshotCatalog(data_dir).add(snapshot_entry(path))
+    return Snapshot.open(path)
+
+
+def donation(name, amount, day):
+    return {"Donor_Name": name, "Amount": amount, "Date": day}
+
+
+def history(data_dir):
+    with open(history_aggregates_path(data_dir)) as f:
+        return json.load(f)
+
+
+def test_merged_partials_match_one_snapshot_of_all_rows(tmp_path):
+    first = [donation("Jane", 10, "2024-01-15"), donation(None, 5, "2024-01-16")]
+    second = [donation("Jane", 20, "2024-01-15"), donation("Bob", 7, "2024-02-01"), donation("Ann", 1, None)]
+    write_snapshot(first, str(tmp_path / "a.dsnap"))
+    write_snapshot(second, str(tmp_path / "b.dsnap"))
+    write_snapshot(first + second, str(tmp_path / "all.dsnap"))
+
+    merged = PartialAggregate.from_snapshot(Snapshot.open(str(tmp_path / "a.dsnap")))
+    merged.merge(PartialAggregate.from_snapshot(Snapshot.open(str(tmp_path / "b.dsnap"))))
+    whole = PartialAggregate.from_snapshot(Snapshot.open(str(tmp_path / "all.dsnap")))
+
+    assert merged.snapshots == ["a.dsnap", "b.dsnap"]
+    expected = whole.to_aggregates()
+    actual = merged.to_aggregates()
+    assert actual["snapshot_count"] == 2
+    for key in ("total_donations", "total_amount", "active_donors", "top_donors", "monthly_totals", "daily"):
+        assert actual[key] == expected[key]
+    assert actual["active_donors"] == 3
+    assert actual["daily"]["counts"][0] == 2
+
+
+def test_partial_survives_a_round_trip_through_json(tmp_path):
+    write_snapshot([donation("Jane", 10, "2024-01-15")], str(tmp_path / "a.dsnap"))
+    partial = PartialAggregate.from_snapshot(Snapshot.open(str(tmp_path / "a.dsnap")))
+
+    restored = PartialAggregate.from_dict(json.loads(json.dumps(partial.to_dict())))
+    assert restored.to_aggregates() == partial.to_aggregates()
+
+
+def test_uploads_are_added_once_and_sync_rebuilds_after_removal(tmp_path):
+    data_dir = str(tmp_path)
+    first = upload(data_dir, "donations_1.dsnap", [donation("Jane", 10, "2024-01-15")])
+    sync_history(data_dir)
+    second = upload(data_dir, "donations_2.dsnap", [donation("Bob", 5, "2024-02-01")])
+    add_to_history(second, data_dir)
+    add_to_history(second, data_dir)
+    assert (history(data_dir)["total_donations"], history(data_dir)["total_amount"]) == (2, 15.0)
+
+    os.remove(os.path.join(data_dir, first.name))
+    SnapshotCatalog(data_dir).rebuild()
+    sync_history(data_dir)
+    assert (history(data_dir)["total_donations"], history(data_dir)["total_amount"]) == (1, 5.0)
+
+
+def test_state_from_another_version_is_rebuilt(tmp_path):
+    data_dir = str(tmp_path)
+    snapshot = upload(data_dir, "donations_1.dsnap", [donation("Jane", 10, "2024-01-15")])
+    with open(history_state_path(data_dir), "w") as f:
+        json.dump({"version": PartialAggregate.VERSION - 1}, f)
+
+    add_to_history(snapshot, data_dir)
+    assert history(data_dir)["total_donations"] == 1
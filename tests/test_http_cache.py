@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, timezone
+
+from starlette.requests import Request
+
+from app.http_cache import http_date, is_not_modified
+
+
+ETAG = '"abc123"'
+MODIFIED = datetime(2024, 1, 15, 12, 30, 45, 500000, tzinfo=timezone.utc)
+
+
+def request(**headers):
+    return Request({
+        "type": "http",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_matching_etag_is_not_modified():
+    assert is_not_modified(request(if_none_match=ETAG), ETAG)
+    assert is_not_modified(request(if_none_match=f'"other", W/{ETAG}'), ETAG)
+    assert is_not_modified(request(if_none_match="*"), ETAG)
+    assert not is_not_modified(request(if_none_match='"other"'), ETAG)
+    assert not is_not_modified(request(), ETAG, MODIFIED)
+
+
+def test_weak_etag_matches_either_form():
+    assert is_not_modified(request(if_none_match=f"W/{ETAG}"), f"W/{ETAG}")
+    assert is_not_modified(request(if_none_match=ETAG), f"W/{ETAG}")
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    headers = {"if_none_match": '"other"', "if_modified_since": http_date(MODIFIED + timedelta(days=1))}
+    assert not is_not_modified(request(**headers), ETAG, MODIFIED)
+
+
+def test_if_modified_since_compares_whole_seconds():
+    assert is_not_modified(request(if_modified_since=http_date(MODIFIED)), ETAG, MODIFIED)
+    earlier = http_date(MODIFIED - timedelta(seconds=1))
+    assert not is_not_modified(request(if_modified_since=earlier), ETAG, MODIFIED)
+    assert not is_not_modified(request(if_modified_since="yesterday"), ETAG, MODIFIED)
+    assert not is_not_modified(request(if_modified_since=http_date(MODIFIED)), ETAG)
+
+
+def test_zone_less_if_modified_since_is_read_as_utc():
+    assert is_not_modified(request(if_modified_since="Mon, 15 Jan 2024 12:30:45 -0000"), ETAG, MODIFIED)
+    assert is_not_modified(request(if_modified_since="Mon, 15 Jan 2024 12:30:45"), ETAG, MODIFIED)
+    assert not is_not_modified(request(if_modified_since="Mon, 15 Jan 2024 12:30:44"), ETAG, MODIFIED)
@@ -0,0 +1,92 @@
+from datetime import date
+
+import pytest
+
+from app.rollup import DailyIndex
+from app.snapshot import to_day_ordinals
+
+
+def index(totals):
+    """A DailyIndex over ``{iso_date: (amount, count)}``."""
+    dates = sorted(totals)
+    return DailyIndex(
+        to_day_ordinals(dates).tolist(),
+        [totals[d][0] for d in dates],
+        [totals[d][1] for d in dates],
+    )
+
+
+DONATIONS = index({
+    "2024-01-01": (10.0, 1),   # Monday
+    "2024-01-07": (20.0, 2),   # Sunday
+    "2024-01-08": (5.0, 1),    # Monday
+    "2024-02-29": (7.5, 1),
+    "2025-03-01": (100.0, 4),
+})
+
+
+def summary(buckets):
+    return [(b["period"], b["start"], b["end"], b["amount"], b["count"]) for b in buckets]
+
+
+def test_range_totals_are_half_open():
+    first = to_day_ordinals(["2024-01-07"])[0]
+    assert DONATIONS.range_totals(first, first + 1) == (20.0, 2)
+    assert DONATIONS.range_totals(first, first + 2) == (25.0, 3)
+    assert DONATIONS.range_totals(0, first) == (10.0, 1)
+
+
+def test_week_buckets_start_on_monday_and_are_clipped():
+    buckets = DONATIONS.rollup(date(2024, 1, 3), date(2024, 1, 10), "week")
+    assert summary(buckets) == [
+        ("2024-W01", "2024-01-03", "2024-01-07", 20.0, 2),
+        ("2024-W02", "2024-01-08", "2024-01-10", 5.0, 1),
+    ]
+
+
+def test_month_buckets_are_clipped_to_the_range():
+    buckets = DONATIONS.rollup(date(2024, 1, 5), date(2024, 3, 10), "month")
+    assert summary(buckets) == [
+        ("2024-01", "2024-01-05", "2024-01-31", 25.0, 3),
+        ("2024-02", "2024-02-01", "2024-02-29", 7.5, 1),
+        ("2024-03", "2024-03-01", "2024-03-10", 0.0, 0),
+    ]
+
+
+def test_year_buckets_default_to_the_data_range():
+    buckets = DONATIONS.rollup(None, None, "year")
+    assert summary(buckets) == [
+        ("2024", "2024-01-01", "2024-12-31", 42.5, 5),
+        ("2025", "2025-01-01", "2025-03-01", 100.0, 4),
+    ]
+
+
+def test_a_single_bound_outside_the_data_gives_no_buckets():
+    assert DONATIONS.rollup(date(2030, 1, 1), None, "month") == []
+    assert DONATIONS.rollup(None, date(2020, 1, 1), "month") == []
+    assert summary(DONATIONS.rollup(date(2025, 2, 15), None, "month")) == [
+        ("2025-02", "2025-02-15", "2025-02-28", 0.0, 0),
+        ("2025-03", "2025-03-01", "2025-03-01", 100.0, 4),
+    ]
+
+
+def test_bounds_given_in_the_wrong_order_are_rejected():
+    with pytest.raises(ValueError):
+        DONATIONS.rollup(date(2024, 2, 1), date(2024, 1, 1), "day")
+
+
+def test_unknown_granularity_and_too_many_buckets_are_rejected():
+    with pytest.raises(ValueError):
+        DONATIONS.rollup(None, None, "hour")
+    with pytest.raises(ValueError):
+        DONATIONS.rollup(date(1900, 1, 1), date(2024, 1, 1), "day")
+
+
+def test_empty_index():
+    empty = DailyIndex([], [], [])
+    assert empty.first_date is None
+    assert empty.rollup(None, None, "day") == []
+    assert summary(empty.rollup(date(2024, 1, 1), date(2024, 1, 2), "day")) == [
+        ("2024-01-01", "2024-01-01", "2024-01-01", 0.0, 0),
+        ("2024-01-02", "2024-01-02", "2024-01-02", 0.0, 0),
+    ]
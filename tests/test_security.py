@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.security import LoginBusyError, PasswordChecker, TokenCache, create_access_token, token_cache, verify_access_token
+
+
+def test_cached_claims_expire_after_ttl_or_exp(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    cache = TokenCache(ttl=60)
+    cache.put("a", {"sub": "admin"})
+    cache.put("b", {"sub": "admin", "exp": 1010})
+
+    assert cache.get("a") == {"sub": "admin"}
+    now[0] = 1010
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    now[0] = 1060
+    assert cache.get("a") is None
+    assert cache.stats() == {"hits": 2, "misses": 2, "entries": 0}
+
+
+def test_least_recently_used_token_is_evicted():
+    cache = TokenCache(max_entries=2)
+    cache.put("a", {"sub": "1"})
+    cache.put("b", {"sub": "2"})
+    cache.get("a")
+    cache.put("c", {"sub": "3"})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_only_verified_tokens_are_cached():
+    token = create_access_token("admin")
+    before = token_cache.stats()["entries"]
+    assert verify_access_token(token)["sub"] == "admin"
+    assert verify_access_token(token + "x") is None
+    assert token_cache.stats()["entries"] == before + 1
+    assert token_cache.get(token)["sub"] == "admin"
+
+
+class SlowStore:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def verify_password(self, username, password):
+        self.release.wait(5)
+        return password == "secret"
+
+
+def test_password_checks_run_off_the_event_loop():
+    store = SlowStore()
+    store.release.set()
+    checker = PasswordChecker(store, workers=1, max_pending=1)
+    try:
+        assert asyncio.run(checker.verify_password("admin", "secret"))
+        assert not asyncio.run(checker.verify_password("admin", "wrong"))
+        assert checker.pending == 0
+    finally:
+        checker.shutdown()
+
+
+def test_logins_beyond_max_pending_are_refused_at_once():
+    store = SlowStore()
+    checker = PasswordChecker(store, workers=1, max_pending=2)
+
+    async def burst():
+        first = asyncio.ensure_future(checker.verify_password("admin", "secret"))
+        second = asyncio.ensure_future(checker.verify_password("admin", "wrong"))
+        await asyncio.sleep(0)
+        with pytest.raises(LoginBusyError):
+            await checker.verify_password("admin", "secret")
+        store.release.set()
+        return await first, await second
+
+    try:
+        assert asyncio.run(burst()) == (True, False)
+        assert (checker.pending, checker.rejected) == (0, 1)
+    finally:
+        checker.shutdown()
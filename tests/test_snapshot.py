@@ -0,0 +1,133 @@
+import json
+import math
+
+import numpy as np
+
+from app.catalog import SnapshotCatalog
+from app.snapshot import (
+    DATE_NULL, NULL_CODE, Snapshot, SnapshotWriter, list_snapshot_files, to_day_ordinals, write_snapshot,
+)
+from app.snapshot import main as snapshot_main
+
+
+def test_round_trip_keeps_values_and_types(tmp_path):
+    path = tmp_path / "donations_1.dsnap"
+    records = [
+        {"Donor_Name": "Jane", "Amount": 250.5, "Date": "2024-01-16", "Transaction_ID": "Z1", "Notes": "Gift"},
+        {"Donor_Name": "Bob", "Amount": 75, "Date": "2024-01-17", "Transaction_ID": "Z2", "Notes": "Monthly"},
+    ]
+    write_snapshot(records, str(path), {"source": "test.xlsx"})
+
+    snapshot = Snapshot.open(str(path))
+    assert len(snapshot) == 2
+    assert snapshot.metadata == {"source": "test.xlsx"}
+    assert snapshot.header["total_amount"] == 325.5
+    assert snapshot.amount.dtype == np.float64
+    assert snapshot.dates.dtype == np.int32
+    assert snapshot.dates.tolist() == to_day_ordinals(["2024-01-16", "2024-01-17"]).tolist()
+    assert [snapshot.record(i) for i in range(2)] == [
+        {**record, "Amount": float(record["Amount"]), "Email": None, "Payment_Method": None}
+        for record in records
+    ]
+
+
+def test_missing_values_are_stored_as_nulls(tmp_path):
+    path = tmp_path / "donations_1.dsnap"
+    records = [
+        {"Donor_Name": None, "Amount": None, "Date": None, "Notes": None},
+        {"Donor_Name": "", "Amount": float("nan"), "Date": "not a date", "Notes": ""},
+        {"Donor_Name": "Jane", "Amount": 10, "Date": "2024-01-16", "Notes": "Gift"},
+    ]
+    write_snapshot(records, str(path))
+
+    snapshot = Snapshot.open(str(path))
+    assert np.isnan(snapshot.amount[:2]).all()
+    assert snapshot.header["total_amount"] == 10
+    assert snapshot.dates[:2].tolist() == [DATE_NULL, DATE_NULL]
+    assert snapshot.column("Donor_Name").codes.tolist() == [NULL_CODE, NULL_CODE, 0]
+    assert snapshot.column("Email").codes.tolist() == [NULL_CODE] * 3
+    assert snapshot.record(1) == {
+        "Donor_Name": None, "Amount": None, "Date": None, "Notes": None, "Email": None, "Payment_Method": None,
+    }
+
+
+def test_columns_first_seen_mid_stream_are_back_filled(tmp_path):
+    path = tmp_path / "donations_1.dsnap"
+    writer = SnapshotWriter(str(path))
+    writer.write([{"Donor_Name": "Jane", "Amount": 1}, {"Donor_Name": "Bob", "Amount": 2}])
+    writer.write([{"Donor_Name": "Jane", "Amount": 3, "Campaign": "Spring", "Notes": "héllo"}])
+    writer.close()
+
+    snapshot = Snapshot.open(str(path))
+    assert snapshot.columns[:4] == ["Donor_Name", "Amount", "Campaign", "Notes"]
+    assert [snapshot.record(i)["Campaign"] for i in range(3)] == [None, None, "Spring"]
+    assert snapshot.column("Notes")[2] == "héllo"
+    # The dictionary is shared across chunks
+    assert snapshot.column("Donor_Name").codes.tolist() == [0, 1, 0]
+
+
+def test_legacy_json_snapshot_opens_like_dsnap(tmp_path):
+    path = tmp_path / "donations_1.json"
+    path.write_text(json.dumps([{"Donor_Name": "Jane", "Amount": 5, "Date": "2024-01-16"}]))
+
+    snapshot = Snapshot.open(str(path))
+    assert snapshot.record(0)["Donor_Name"] == "Jane"
+    assert snapshot.amount.tolist() == [5.0]
+
+
+def test_write_snapshot_rows_matches_writing_records(tmp_path):
+    first = [
+        {"Donor_Name": "Jane", "Amount": 5, "Date": "2024-01-02", "Transaction_ID": "T1"},
+        {"Donor_Name": None, "Amount": None, "Date": None, "Transaction_ID": "T2", "Notes": "héllo"},
+    ]
+    second = [
+        {"Amount": 7, "Payment_Method": "Zelle", "Campaign": "Spring", "Transaction_ID": "T3"},
+        {"Donor_Name": "Bob", "Amount": 3, "Email": "bob@example.com", "Transaction_ID": "T4"},
+        {"Donor_Name": "Jane", "Amount": 1, "Transaction_ID": ""},
+    ]
+    write_snapshot(first, str(tmp_path / "a.dsnap"))
+    write_snapshot(second, str(tmp_path / "b.dsnap"))
+    parts = [Snapshot.open(str(tmp_path / name)) for name in ("a.dsnap", "b.dsnap")]
+    expected_records = [part.record(i) for part in parts for i in range(len(part))]
+
+    writer = SnapshotWriter(str(tmp_path / "merged.dsnap"))
+    for part in parts:
+        writer.write_snapshot_rows(part)
+    writer.close()
+    write_snapshot(expected_records, str(tmp_path / "expected.dsnap"))
+
+    merged = Snapshot.open(str(tmp_path / "merged.dsnap"))
+    expected = Snapshot.open(str(tmp_path / "expected.dsnap"))
+    assert merged.columns == expected.columns
+    assert [merged.record(i) for i in range(len(merged))] == [expected.record(i) for i in range(len(expected))]
+    assert math.isclose(merged.header["total_amount"], 16)
+
+
+def test_write_snapshot_rows_copies_only_selected_rows(tmp_path):
+    records = [{"Donor_Name": f"D{i}", "Amount": i, "Notes": "n" * i} for i in range(5)]
+    write_snapshot(records, str(tmp_path / "a.dsnap"))
+    source = Snapshot.open(str(tmp_path / "a.dsnap"))
+
+    writer = SnapshotWriter(str(tmp_path / "b.dsnap"))
+    writer.write_snapshot_rows(source, np.array([1, 3]))
+    writer.close()
+
+    snapshot = Snapshot.open(str(tmp_path / "b.dsnap"))
+    assert [snapshot.record(i)["Notes"] for i in range(2)] == ["n", "nnn"]
+    assert snapshot.amount.tolist() == [1.0, 3.0]
+    # Dictionary values of rows that were left out are not carried over
+    assert snapshot.column("Donor_Name").to_list() == ["D1", "D3"]
+    assert len(snapshot.column("Donor_Name").values) == 2
+
+
+def test_json_kept_next_to_its_conversion_is_listed_once(tmp_path):
+    (tmp_path / "donations_1.json").write_text(json.dumps([{"Amount": 5}]))
+    (tmp_path / "donations_2.json").write_text(json.dumps([{"Amount": 6}]))
+
+    snapshot_main([str(tmp_path), "--keep-json"])
+
+    assert (tmp_path / "donations_1.json").exists()
+    assert sorted(list_snapshot_files(str(tmp_path))) == ["donations_1.dsnap", "donations_2.dsnap"]
+    assert sorted(e["filename"] for e in SnapshotCatalog(str(tmp_path)).entries()) == [
+        "donations_1.dsnap", "donations_2.dsnap",
+    ]
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from app.ingest import ingest_excel
+from app.snapshot import DATE_NULL, Snapshot, day_to_iso, to_day_ordinals
+from app.validation import RowValidator
+
+
+def test_non_iso_dates_are_parsed():
+    days = to_day_ordinals(["2024-01-15", "09/15/2026", "15/01/2024", "Jan 15, 2024", "1/2/2024", None, "soon"])
+    assert [day_to_iso(day) for day in days] == [
+        "2024-01-15", "2026-09-15", "2024-01-15", "2024-01-15", "2024-01-02", "", "",
+    ]
+
+
+def test_amounts_are_cleaned_and_invalid_rows_rejected():
+    validator = RowValidator()
+    valid = validator([
+        {"Donor_Name": "  Jane   Doe ", "Amount": "$1,250.50", "Date": "09/15/2026"},
+        {"Donor_Name": "Bob", "Amount": "n/a", "Date": "2024-01-15"},
+        {"Donor_Name": "Ann", "Amount": 5, "Date": "someday"},
+        {"Donor_Name": "Joe", "Amount": 7, "Date": None},
+    ])
+
+    assert valid["Donor_Name"].tolist() == ["Jane Doe", "Joe"]
+    assert valid["Amount"].dtype == np.float64
+    assert valid["Amount"].tolist() == [1250.5, 7.0]
+    assert [day_to_iso(day) for day in to_day_ordinals(valid["Date"])] == ["2026-09-15", ""]
+    report = validator.report()
+    assert report["rejected"] == 2
+    assert [(error["row"], error["column"]) for error in report["errors"]] == [(2, "Amount"), (3, "Date")]
+
+
+def test_malformed_email_keeps_the_row_with_a_warning():
+    validator = RowValidator()
+    valid = validator([
+        {"Amount": 10, "Email": " Jane@Example.com "},
+        {"Amount": 20, "Email": "jane(at)example"},
+    ])
+
+    assert valid["Email"].tolist() == ["jane@example.com", None]
+    assert valid["Amount"].tolist() == [10.0, 20.0]
+    report = validator.report()
+    assert report["rejected"] == 0
+    assert report["warned"] == 1
+    assert report["warnings"][0]["row"] == 2
+    assert report["warnings"][0]["value"] == "jane(at)example"
+
+
+def test_rows_are_numbered_across_chunks():
+    validator = RowValidator()
+    validator([{"Amount": 1}, {"Amount": 2}])
+    validator([{"Amount": "x"}])
+    assert validator.report()["errors"][0]["row"] == 3
+
+
+def test_chunks_are_validated_as_dataframes():
+    chunk = pd.DataFrame({"Amount": ["5", "x"], "Date": ["2024-01-15", "2024-01-16"], "Notes": ["a", "b"]}, dtype=object)
+    valid = RowValidator()(chunk)
+
+    assert isinstance(valid, pd.DataFrame)
+    assert valid.to_dict("list")["Notes"] == ["a"]
+    assert chunk["Amount"].tolist() == ["5", "x"]
+
+
+def test_us_style_csv_upload_is_stored(tmp_path):
+    upload = tmp_path / "processor.csv"
+    upload.write_text("Donor_Name,Amount,Date,Email\nJane,100,09/15/2026,jane@example\nBob,50,Jan 15 2024,bob@example.com\n")
+
+    result = ingest_excel(str(upload), "processor.csv", str(tmp_path / "data"))
+
+    assert result["records_count"] == 2
+    assert result["rejected"] == 0
+    assert result["warned"] == 1
+    snapshot = Snapshot.open(result["file_path"])
+    assert snapshot.amount.tolist() == [100.0, 50.0]
+    assert snapshot.dates.tolist() == to_day_ordinals(["2026-09-15", "2024-01-15"]).tolist()
+    assert not np.any(snapshot.dates == DATE_NULL)
@@ -0,0 +1,30 @@
+import io
+
+from fastapi.testclient import TestClient
+from openpyxl import load_workbook
+
+from app.workbook_template import TemplateCache
+
+
+def test_template_etag_is_stable_across_builds():
+    campaigns = {"default": ["Donor_Name", "Amount"], "gala": ["Donor_Name", "Table_Number"]}
+    first = TemplateCache(campaigns).get("gala")
+    second = TemplateCache(campaigns).get("gala")
+
+    assert first.etag == second.etag
+    assert first.etag.startswith('W/"')
+    assert first.etag != TemplateCache(campaigns).get("default").etag
+    assert TemplateCache(campaigns).get("unknown") is None
+    rows = list(load_workbook(io.BytesIO(first.content)).active.values)
+    assert rows[0] == ("Donor_Name", "Table_Number")
+    assert rows[1] == ("John Doe", None)
+
+
+def test_download_is_revalidated_with_the_weak_etag():
+    from app.main import app
+
+    client = TestClient(app)
+    response = client.get("/download-template")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert client.get("/download-template", headers={"If-None-Match": etag}).status_code == 304